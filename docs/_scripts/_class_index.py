@@ -0,0 +1,355 @@
+"""Static index of the classes and event emitters of a package, built with ``ast``.
+
+Finding every ``EventedModel`` subclass of napari by walking its modules with
+``dir()`` and ``getattr()`` imports and touches the whole package, Qt modules
+included. This module instead parses the package sources, records the top
+level classes of each module with the bases as written, and the names each
+module imports. Bases are then resolved through imports and re-exports, so the
+subclasses of a class can be listed, and only their modules imported.
+
+The index also records every ``EmitterGroup(...)`` and
+``self.events.add(...)`` call with its keyword names and enclosing class, so
+generators can list the events of a class without parsing its module again.
+
+The result of parsing a file only depends on its content. It is stored in
+``class_index.json`` in the persistent cache directory, keyed by the path of
+each file. A file whose modification time and size are unchanged is not read
+again, and one whose hash is unchanged is not parsed again.
+
+The analysis is static: classes created dynamically, or whose bases come from
+star imports of modules outside the package, are not found.
+
+Example:
+    List the EventedModel subclasses of napari, without importing it::
+
+        >>> index = load_index('napari')
+        >>> index.subclasses('napari.utils.events.EventedModel')[:2]
+        [('napari.components.camera', 'Camera'), ...]
+
+    List the emitters created in the base Layer class::
+
+        >>> index.emitters('napari.layers.base.base', 'Layer')[0]['names']
+        ['source', 'refresh', 'set_data', ...]
+
+Attributes:
+    INDEX_CACHE (Path): On-disk cache of the parsed files
+    DEFAULT_EXCLUDE (tuple): Directory names that are not indexed
+"""
+
+import ast
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from _fingerprint import CACHE_DIR, iter_files, package_path
+from _output import write_text
+
+INDEX_CACHE = CACHE_DIR / "class_index.json"
+DEFAULT_EXCLUDE = ("_tests", "tests")
+_CACHE_VERSION = 3
+
+
+def _dotted(node):
+    """``a.b.c`` for a name or attribute node, None for other expressions."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _dotted(node.value)
+        return f"{base}.{node.attr}" if base else None
+    if isinstance(node, ast.Subscript):  # Generic bases, e.g. EventedList[T]
+        return _dotted(node.value)
+    return None
+
+
+def _statements(body):
+    """Module level statements, including those in ``if`` and ``try`` blocks."""
+    for node in body:
+        yield node
+        if isinstance(node, ast.If):
+            yield from _statements(node.body)
+            yield from _statements(node.orelse)
+        elif isinstance(node, ast.Try) or type(node).__name__ == "TryStar":
+            for block in (node.body, node.orelse, node.finalbody):
+                yield from _statements(block)
+            for handler in node.handlers:
+                yield from _statements(handler.body)
+
+
+class EmitterVisitor(ast.NodeVisitor):
+    """Collect the ``EmitterGroup(...)`` and ``self.events.add(...)`` calls.
+
+    Each call is recorded in `emitters` as a dict with the enclosing class
+    (dotted for nested classes, None at module level), the ``call``
+    (``EmitterGroup`` or ``add``), the keyword ``names`` and whether the
+    names are ``undecided``, e.g. for ``events.add(**emitters)``.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.emitters = []
+        self._classes = []
+
+    def visit_ClassDef(self, node):
+        self._classes.append(node.name)
+        self.generic_visit(node)
+        self._classes.pop()
+
+    def visit_Call(self, node):
+        func = node.func
+        if getattr(func, "id", None) == "EmitterGroup":
+            call = "EmitterGroup"
+        elif (
+            isinstance(func, ast.Attribute)
+            and func.attr == "add"
+            and getattr(func.value, "attr", None) == "events"
+            # events of other objects, e.g. self.layer.events, are theirs
+            and getattr(func.value.value, "id", None) == "self"
+        ):
+            call = "add"
+        else:
+            call = None
+        if call is not None:
+            self.emitters.append(
+                {
+                    "class": ".".join(self._classes) or None,
+                    "call": call,
+                    "names": [kw.arg for kw in node.keywords if kw.arg],
+                    "undecided": any(kw.arg is None for kw in node.keywords)
+                    or (call == "add" and bool(node.args)),
+                }
+            )
+        self.generic_visit(node)
+
+
+def scan_module(source, name, is_package=False):
+    """Classes, imported names and emitters of module `name` with code `source`.
+
+    Returns
+    -------
+    dict
+        ``classes`` maps class names to their bases as written, ``names``
+        maps imported names to their qualified name, ``star`` lists the
+        modules imported with ``*`` and ``emitters`` the calls found by
+        :class:`EmitterVisitor`.
+    """
+    package = name if is_package else name.rpartition(".")[0]
+    classes, names, star = {}, {}, []
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return {"classes": classes, "names": names, "star": star, "emitters": []}
+    for node in _statements(tree.body):
+        if isinstance(node, ast.ClassDef):
+            classes[node.name] = [base for base in map(_dotted, node.bases) if base]
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    names[alias.asname] = alias.name
+                else:
+                    top = alias.name.partition(".")[0]
+                    names[top] = top
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split(".")
+                parts = parts[: len(parts) - node.level + 1]
+                base = ".".join(parts + ([node.module] if node.module else []))
+            else:
+                base = node.module or ""
+            for alias in node.names:
+                if alias.name == "*":
+                    star.append(base)
+                else:
+                    names[alias.asname or alias.name] = f"{base}.{alias.name}"
+    visitor = EmitterVisitor()
+    visitor.visit(tree)
+    return {
+        "classes": classes,
+        "names": names,
+        "star": star,
+        "emitters": visitor.emitters,
+    }
+
+
+class ClassIndex:
+    """Classes and imports of all modules of a package.
+
+    Parameters
+    ----------
+    modules : dict
+        Maps module names to the result of :func:`scan_module`.
+    """
+
+    def __init__(self, modules):
+        self.modules = modules
+
+    @classmethod
+    def build(
+        cls,
+        package,
+        root=None,
+        exclude=DEFAULT_EXCLUDE,
+        cache_path=INDEX_CACHE,
+    ):
+        """Index the sources of `package`, reusing cached results.
+
+        Returns None if the sources of `package` cannot be found.
+        """
+        root = Path(root) if root else package_path(package)
+        if root is None or not root.is_dir():
+            return None
+        cache = _load_cache(cache_path)
+        files = {}
+        modules = {}
+        stubs = {}
+        for path in iter_files(root):
+            rel = path.relative_to(root)
+            if path.suffix not in (".py", ".pyi") or set(exclude) & set(rel.parts[:-1]):
+                continue
+            is_package = rel.stem == "__init__"
+            parts = [package, *rel.parent.parts]
+            if not is_package:
+                parts.append(rel.stem)
+            name = ".".join(parts)
+            key = f"{package}/{rel.as_posix()}"
+            stat = path.stat()
+            entry = cache.get(key)
+            if (
+                entry is None
+                or entry["mtime_ns"] != stat.st_mtime_ns
+                or entry["size"] != stat.st_size
+            ):
+                data = path.read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                scan = (
+                    entry["scan"]
+                    if entry is not None and entry["hash"] == digest
+                    else scan_module(data, name, is_package)
+                )
+                entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "hash": digest,
+                    "scan": scan,
+                }
+            files[key] = entry
+            if path.suffix == ".pyi":
+                stubs[name] = entry["scan"]
+            else:
+                modules[name] = entry["scan"]
+        # lazily loaded packages declare their exports in a stub file
+        for name, scan in stubs.items():
+            module = modules.setdefault(
+                name, {"classes": {}, "names": {}, "star": [], "emitters": []}
+            )
+            for alias, target in scan["names"].items():
+                module["names"].setdefault(alias, target)
+        # keep the entries of other packages
+        files.update(
+            (key, entry)
+            for key, entry in cache.items()
+            if not key.startswith(f"{package}/")
+        )
+        if files != cache:
+            _save_cache(cache_path, files)
+        return cls(modules)
+
+    def resolve(self, module, dotted, _seen=None):
+        """Qualified name of what `dotted` refers to in `module`.
+
+        Classes of the package resolve to ``module.Class`` of the module
+        defining them. Names from other packages resolve to their import
+        path, and unknown names to None.
+        """
+        _seen = set() if _seen is None else _seen
+        if (module, dotted) in _seen:
+            return None
+        _seen.add((module, dotted))
+        scan = self.modules.get(module)
+        if scan is None:
+            return None
+        head, _, rest = dotted.partition(".")
+        if head in scan["classes"]:
+            return None if rest else f"{module}.{head}"
+        if head in scan["names"]:
+            target = scan["names"][head] + (f".{rest}" if rest else "")
+            return self.canonical(target, _seen)
+        for star in scan["star"]:
+            found = self.resolve(star, dotted, _seen)
+            if found is not None:
+                return found
+        if f"{module}.{head}" in self.modules:  # submodule of a package
+            target = f"{module}.{head}" + (f".{rest}" if rest else "")
+            return self.canonical(target, _seen)
+        return None
+
+    def canonical(self, qualified, _seen=None):
+        """Qualified name of the definition of `qualified`, see `resolve`."""
+        parts = qualified.split(".")
+        for i in range(len(parts) - 1, 0, -1):
+            module = ".".join(parts[:i])
+            if module in self.modules:
+                return self.resolve(module, ".".join(parts[i:]), _seen)
+        return qualified
+
+    def subclasses(self, *bases):
+        """Classes deriving from any of `bases`, directly or not, included.
+
+        Returns
+        -------
+        list of (str, str)
+            Module and class names, by module, then in source order.
+        """
+        children = {}
+        for module, scan in self.modules.items():
+            for name, class_bases in scan["classes"].items():
+                for dotted in class_bases:
+                    parent = self.resolve(module, dotted)
+                    if parent is not None:
+                        children.setdefault(parent, []).append(f"{module}.{name}")
+        found = set()
+        pending = [self.canonical(base) for base in bases]
+        while pending:
+            qualified = pending.pop()
+            if qualified in found:
+                continue
+            found.add(qualified)
+            pending.extend(children.get(qualified, ()))
+        return [
+            (module, name)
+            for module in sorted(self.modules)
+            for name in self.modules[module]["classes"]
+            if f"{module}.{name}" in found
+        ]
+
+    def emitters(self, module, cls=None):
+        """Emitter calls recorded in `module`, only those in `cls` if given.
+
+        See :class:`EmitterVisitor` for the recorded fields.
+        """
+        scan = self.modules.get(module)
+        if scan is None:
+            return []
+        return [
+            call for call in scan["emitters"] if cls is None or call["class"] == cls
+        ]
+
+
+@lru_cache(maxsize=None)
+def load_index(package):
+    """The :class:`ClassIndex` of `package`, built once per process."""
+    return ClassIndex.build(package)
+
+
+def _load_cache(path):
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != _CACHE_VERSION:
+        return {}
+    return data["files"]
+
+
+def _save_cache(path, files):
+    write_text(path, json.dumps({"version": _CACHE_VERSION, "files": files}))
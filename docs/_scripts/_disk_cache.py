@@ -0,0 +1,85 @@
+"""Size-bounded persistent cache of JSON values.
+
+Some steps of the generators, such as parsing the numpydoc docstrings of
+every napari class, give the same result for the same input on every run.
+:class:`DiskCache` stores such results in a JSON file in the persistent cache
+directory. Each value is stored under a key, e.g. the qualified name of a
+class, together with a digest of the input it was computed from; a value is
+only returned if the digest still matches.
+
+The cache keeps at most ``max_entries`` values and evicts the least recently
+used ones, so entries of renamed or removed classes do not accumulate.
+
+Example:
+    Cache the parsed docstring of a class::
+
+        >>> cache = DiskCache(CACHE_DIR / 'class_docs.json')
+        >>> docs = cache.get(name, digest)
+        >>> if docs is None:
+        ...     docs = parse(kls)
+        ...     cache.set(name, digest, docs)
+        >>> cache.save()
+
+Attributes:
+    DEFAULT_MAX_ENTRIES (int): Number of values kept by default
+"""
+
+import json
+from pathlib import Path
+
+from _output import write_text
+
+DEFAULT_MAX_ENTRIES = 5000
+_CACHE_VERSION = 1
+
+
+class DiskCache:
+    """JSON values by key, validated by a digest of their input.
+
+    Parameters
+    ----------
+    path : Path
+        JSON file holding the cache, created by :meth:`save`.
+    max_entries : int, optional
+        Number of values kept, the least recently used are evicted first.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != _CACHE_VERSION:
+            return {}
+        return data["entries"]
+
+    def get(self, key, digest):
+        """The value stored for `key` if it was computed from `digest`."""
+        entry = self._entries.get(key)
+        if entry is None or entry["digest"] != digest:
+            return None
+        # most recently used entries are kept last
+        self._entries[key] = self._entries.pop(key)
+        return entry["value"]
+
+    def set(self, key, digest, value):
+        """Store `value`, computed from an input with hash `digest`."""
+        self._entries.pop(key, None)
+        self._entries[key] = {"digest": digest, "value": value}
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def save(self):
+        """Write the cache to disk, if its content changed."""
+        write_text(
+            self.path,
+            json.dumps({"version": _CACHE_VERSION, "entries": self._entries}),
+        )
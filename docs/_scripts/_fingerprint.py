@@ -0,0 +1,220 @@
+"""Input fingerprints for incremental documentation generation.
+
+Every documentation generator called by ``prep_docs.py`` reads a known set of
+inputs: the installed napari version, the source files it introspects, its
+template and, for the release index, the ``release_*.md`` files. This module
+hashes those inputs into a single fingerprint and keeps a manifest of the
+fingerprints of the last successful run of each generator under
+``docs/_build``, together with a hash of every output written by that run. A
+generator whose fingerprint matches the manifest, and whose outputs are still
+the ones it wrote, does not need to run again; outputs that are missing or
+were overwritten since, e.g. by ``prep_docs.py --stubs``, make it run again.
+
+Generators describe their inputs with a ``fingerprint_inputs()`` function that
+returns keyword arguments for :func:`fingerprint`, and list the files they
+write in a module level ``OUTPUTS`` list.
+
+Example:
+    Fingerprint a generator and check it against the manifest::
+
+        >>> import update_release_docs as gen
+        >>> digest = fingerprint(**gen.fingerprint_inputs())
+        >>> manifest = load_manifest()
+        >>> is_up_to_date(manifest, 'update_release_docs', digest, gen.OUTPUTS)
+
+Attributes:
+    DOCS (Path): Absolute path to the docs directory
+    MANIFEST_PATH (Path): Location of the fingerprint manifest
+    CACHE_DIR (Path): Persistent cache for generated artifacts. Unlike
+        ``docs/_build`` it survives ``make clean``. Defaults to
+        ``~/.cache/napari-docs`` and can be set with ``NAPARI_DOCS_CACHE``.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from importlib.util import find_spec
+from pathlib import Path
+
+DOCS = Path(__file__).parent.parent.absolute()
+MANIFEST_PATH = DOCS / "_build" / "prep_manifest.json"
+CACHE_DIR = Path(
+    os.environ.get("NAPARI_DOCS_CACHE")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "napari-docs"
+)
+
+# files that never influence the generated output
+_IGNORED_DIRS = {"__pycache__", ".git", ".mypy_cache", ".pytest_cache"}
+_IGNORED_SUFFIXES = {".pyc", ".pyo"}
+
+
+def package_version(name):
+    """Installed version of distribution `name`, or '' if it is missing."""
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return ""
+
+
+def package_path(name):
+    """Location of the importable package `name`, found without importing it.
+
+    Returns the package directory for packages, the module file for single
+    module distributions, and None if `name` cannot be found.
+    """
+    try:
+        spec = find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    if spec.submodule_search_locations:
+        return Path(next(iter(spec.submodule_search_locations)))
+    return Path(spec.origin) if spec.origin else None
+
+
+def iter_files(path):
+    """Files that make up the content of `path`, sorted, caches excluded."""
+    path = Path(path)
+    if path.is_file():
+        yield path
+        return
+    for item in sorted(path.rglob("*")):
+        if (
+            item.is_file()
+            and item.suffix not in _IGNORED_SUFFIXES
+            and not _IGNORED_DIRS.intersection(item.relative_to(path).parts)
+        ):
+            yield item
+
+
+@lru_cache(maxsize=None)
+def path_digest(path):
+    """Hash of the content of a file, or of all files below a directory.
+
+    Results are cached for the lifetime of the process because several
+    generators fingerprint the same napari source tree.
+    """
+    path = Path(path)
+    digest = hashlib.sha256()
+    if not path.exists():
+        digest.update(b"<missing>")
+        return digest.hexdigest()
+    for file in iter_files(path):
+        rel = file.name if file == path else file.relative_to(path).as_posix()
+        digest.update(rel.encode("utf-8") + b"\0")
+        digest.update(file.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def snapshot(paths):
+    """Cheap summary of `paths` to detect changes: mtime and size per file.
+
+    Unlike :func:`path_digest` nothing is read or cached, so the result can
+    be compared across calls to poll for modifications.
+    """
+    state = {}
+    for path in paths:
+        if not path or not Path(path).exists():
+            continue
+        for file in iter_files(path):
+            try:
+                stat = file.stat()
+            except FileNotFoundError:
+                continue
+            state[file] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def fingerprint(packages=(), paths=(), extra=()):
+    """Combine package versions, file contents and extra values into one hash.
+
+    Parameters
+    ----------
+    packages : iterable of str
+        Distribution names whose installed versions are part of the inputs.
+    paths : iterable of Path
+        Files or directories whose content is part of the inputs. Entries
+        that are None (for example a package that is not installed) are
+        recorded as missing.
+    extra : iterable
+        Any other values, e.g. inline templates, that affect the output.
+        They are hashed through their `str` representation.
+
+    Returns
+    -------
+    str
+        Hex digest identifying this exact set of inputs.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(packages):
+        digest.update(f"{name}=={package_version(name)}\n".encode("utf-8"))
+    for path in paths:
+        entry = path_digest(Path(path).resolve()) if path else "<missing>"
+        digest.update(f"{entry}\n".encode("utf-8"))
+    for value in extra:
+        digest.update(str(value).encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the manifest of fingerprints, empty if missing or unreadable."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def output_digest(path):
+    """Hash of the content of the output file `path`, None if it is missing.
+
+    Unlike :func:`path_digest` the result is not cached, outputs change
+    during the lifetime of the process.
+    """
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def is_up_to_date(manifest, name, digest, outputs=()):
+    """Whether generator `name` produced `outputs` from `digest`, and the
+    outputs were not changed since."""
+    entry = manifest.get(name)
+    if not entry or entry.get("fingerprint") != digest:
+        return False
+    recorded = entry.get("outputs")
+    if not isinstance(recorded, dict):
+        # manifest written before output hashes were recorded
+        return False
+    for output in outputs:
+        current = output_digest(output)
+        if current is None or recorded.get(_relative(output)) != current:
+            return False
+    return True
+
+
+def record(manifest, name, digest, outputs=()):
+    """Store the fingerprint of a successful run of generator `name`, and
+    the hash of each of its `outputs`."""
+    manifest[name] = {
+        "fingerprint": digest,
+        "outputs": {_relative(output): output_digest(output) for output in outputs},
+    }
+
+
+def _relative(path):
+    path = Path(path).absolute()
+    try:
+        return path.relative_to(DOCS).as_posix()
+    except ValueError:
+        return path.as_posix()
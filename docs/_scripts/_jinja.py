@@ -0,0 +1,88 @@
+"""Shared Jinja environment of the documentation generators.
+
+Generators render their pages from the template files in ``templates/``,
+next to this module. All of them share one :class:`jinja2.Environment`,
+created on first use, that compiles each template once per process and
+stores the compiled code in ``docs/_build/jinja_cache``: a template is only
+compiled again when its file changes, even when it renders many pages.
+Template files are regular inputs of the generators, listed in their
+``fingerprint_inputs()`` and watched by ``prep_docs.py --watch``.
+
+The environment uses the Jinja defaults, no autoescaping in particular,
+except that the final newline of a template is kept, so that the output
+ends like the template file. It adds the filters in :data:`FILTERS`.
+
+Example:
+    Render the release notes index::
+
+        >>> from _jinja import render_template
+        >>> text = render_template('release_index.md.jinja', recent=[], ...)
+
+Attributes:
+    TEMPLATES_PATH (Path): Directory of the template files
+    BYTECODE_CACHE_PATH (Path): Directory of the compiled templates
+    FILTERS (dict): Filters available to all templates
+
+Functions:
+    environment(): The shared Jinja environment
+    template_path(name): Path of the template file `name`
+    render_template(name, **context): Render the template `name`
+"""
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from _fingerprint import DOCS
+
+# jinja2 is imported when the environment is created, so that generating the
+# stubs does not pay for importing it.
+
+TEMPLATES_PATH = Path(__file__).resolve().parent / "templates"
+BYTECODE_CACHE_PATH = DOCS / "_build" / "jinja_cache"
+
+
+def code(value):
+    """Format `value` as MyST inline code, even if it contains backticks."""
+    text = str(value)
+    fence = "`" * (max(map(len, re.findall("`+", text)), default=0) + 1)
+    if text.startswith("`") or text.endswith("`"):
+        text = f" {text} "
+    return f"{fence}{text}{fence}"
+
+
+def dateformat(value, format="%B %d, %Y"):
+    """Format a date or datetime, e.g. ``March 05, 2025`` by default."""
+    return value.strftime(format)
+
+
+FILTERS = {
+    "code": code,
+    "dateformat": dateformat,
+}
+
+
+@lru_cache(maxsize=None)
+def environment():
+    """The Jinja environment of the generators, created once per process."""
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    BYTECODE_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES_PATH),
+        bytecode_cache=FileSystemBytecodeCache(BYTECODE_CACHE_PATH),
+        # a template renders exactly as written, final newline included
+        keep_trailing_newline=True,
+    )
+    env.filters.update(FILTERS)
+    return env
+
+
+def template_path(name):
+    """Path of the template file `name`, for ``fingerprint_inputs()``."""
+    return TEMPLATES_PATH / name
+
+
+def render_template(name, **context):
+    """Render the template file `name` with the variables in `context`."""
+    return environment().get_template(name).render(**context)
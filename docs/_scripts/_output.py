@@ -0,0 +1,100 @@
+"""Write generated documentation files only when their content changes.
+
+Sphinx decides which pages to re-read from the modification time of their
+sources and of the files they include. If a generator rewrites an output with
+identical content, the page and everything that includes it is rebuilt for
+nothing. The helpers in this module compare the new content with the file on
+disk and leave the file, and its modification time, untouched if they match.
+
+Files are replaced atomically: the content is written to a temporary file in
+the same directory and moved into place, so an interrupted generator never
+leaves a truncated output behind.
+
+Example:
+    Write a generated page::
+
+        >>> from _output import write_text
+        >>> write_text(DOCS / 'guides' / '_viewer_events.md', table)
+        False
+
+Functions:
+    write_bytes(path, data): Atomically write bytes if they changed
+    write_text(path, text): Atomically write text if it changed
+    open_text(path): Stream text to a file, replaced only if it changed
+    save_pixmap(pixmap, path): Save a Qt pixmap as PNG if the image changed
+"""
+
+import filecmp
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def write_bytes(path, data):
+    """Write `data` to `path` unless the file already holds exactly `data`.
+
+    Returns True if the file was written, False if it was left unchanged.
+    """
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def write_text(path, text, encoding="utf-8"):
+    """Write `text` to `path` unless the file content is already `text`.
+
+    Returns True if the file was written, False if it was left unchanged.
+    """
+    return write_bytes(path, text.encode(encoding))
+
+
+@contextmanager
+def open_text(path, encoding="utf-8"):
+    """Open a text stream whose content replaces `path` if it changed.
+
+    Unlike :func:`write_text`, the content never needs to be held in memory:
+    it is written to a temporary file, compared with `path` chunk by chunk
+    on exit and moved into place only if it differs. Nothing is replaced if
+    the block raises.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        # no newline translation, like write_text
+        with open(tmp, "w", encoding=encoding, newline="") as stream:
+            yield stream
+        if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+            tmp.unlink()
+        else:
+            os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def save_pixmap(pixmap, path, format="PNG"):
+    """Save a QPixmap to `path` unless the encoded image is unchanged.
+
+    Returns True if the file was written, False if it was left unchanged.
+    """
+    from qtpy.QtCore import QBuffer, QByteArray, QIODevice
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    pixmap.save(buffer, format)
+    buffer.close()
+    return write_bytes(path, bytes(data))
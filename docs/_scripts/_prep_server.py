@@ -0,0 +1,288 @@
+"""Long-lived helper process that regenerates documentation from memory.
+
+Every run of ``prep_docs.py`` imports napari, introspects its models, runs
+pydeps and starts Qt again, which makes each ``sphinx-autobuild`` cycle slow.
+``prep_docs.py --serve`` instead starts this server once: it imports the
+generators, runs the expensive ``collect()`` half of each of them and keeps
+the result (event tables, settings sections, dependency graphs) in memory.
+Later requests only run the cheap ``render()`` half, which writes the outputs
+in milliseconds.
+
+The server records the fingerprint of the inputs of each generator when it
+collects its data. ``prep_docs.py --remote`` sends the current fingerprints
+with its request. When the fingerprint of a generator changed because of an
+edit in this directory, e.g. to the generator, ``_table_maker.py`` or a
+template, the server imports the scripts again from their current sources and
+collects and renders with them; napari stays imported, which is most of the
+cost of a cold run. A generator whose other inputs changed, napari or another
+package in particular, or whose outputs are missing, is reported as stale
+instead of rendered from outdated data: it then runs locally, in the client.
+Restart the server to serve it again.
+
+The server listens on a random port of the loopback interface and requires
+an authentication key. Both are stored in ``docs/_build/prep_server.json``,
+where :func:`request` finds them.
+
+Usage:
+    Start the server and keep it running in a terminal::
+
+        $ python docs/_scripts/prep_docs.py --serve
+
+    Regenerate the outputs through the running server::
+
+        $ python docs/_scripts/prep_docs.py --remote
+
+Attributes:
+    SERVED_GENERATORS (list): Generators with a ``collect``/``render`` split
+    STATE_FILE (Path): Address and key of the running server
+    SCRIPTS (Path): Directory of the scripts the server imports again
+"""
+
+import json
+import os
+import secrets
+import sys
+import time
+import traceback
+from importlib import import_module
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+from _profiling import stage
+
+DOCS = Path(__file__).parent.parent.absolute()
+SCRIPTS = Path(__file__).resolve().parent
+STATE_FILE = DOCS / "_build" / "prep_server.json"
+SERVED_GENERATORS = [
+    "update_preference_docs",
+    "update_event_docs",
+    "update_ui_sections_docs",
+]
+
+
+def _in_scripts(path):
+    return path is not None and SCRIPTS in Path(path).resolve().parents
+
+
+def _import_current(name):
+    """Import generator `name` from the current sources of this directory.
+
+    The modules of the scripts directory, helpers included, are dropped from
+    ``sys.modules`` first, so that they are executed again. All other modules,
+    napari in particular, stay imported. Generators imported before keep
+    using the modules they were imported with.
+    """
+    for module_name, module in list(sys.modules.items()):
+        if module_name not in ("__main__", __name__) and _in_scripts(
+            getattr(module, "__file__", None)
+        ):
+            del sys.modules[module_name]
+    return import_module(name)
+
+
+def _fingerprints(module):
+    """Fingerprint of all inputs of a generator `module`, and of the inputs
+    the server cannot import again: the packages and paths outside of the
+    scripts directory."""
+    fingerprint = import_module("_fingerprint")
+    fingerprint.path_digest.cache_clear()
+    inputs = module.fingerprint_inputs()
+    fixed = fingerprint.fingerprint(
+        packages=inputs.get("packages", ()),
+        paths=[path for path in inputs.get("paths", ()) if not _in_scripts(path)],
+    )
+    return fingerprint.fingerprint(**inputs), fixed
+
+
+class PrepServer:
+    """Keeps the collected data of generators in memory and renders on demand.
+
+    Parameters
+    ----------
+    names : list of str
+        Module names of the generators to serve. Each must provide
+        ``collect()`` and ``render(data)`` functions.
+    """
+
+    def __init__(self, names=SERVED_GENERATORS):
+        self.names = list(names)
+        # module that collected the data of each generator, and renders it
+        self._modules = {}
+        self._collected = {}
+        # fingerprint of the inputs of each generator when it was collected
+        self._digests = {}
+        # fingerprint of the inputs outside of the scripts directory when the
+        # server first collected, see `_fingerprints`
+        self._fixed = {}
+
+    def _stale(self, name, current, fixed, digest):
+        """Why the data of `name` cannot be collected here, or None.
+
+        `current` and `fixed` are the fingerprints computed by the server,
+        see `_fingerprints`, and `digest` the one sent by the client.
+        """
+        if fixed != self._fixed[name]:
+            return (
+                "napari or another input outside of docs/_scripts changed "
+                "since the server started"
+            )
+        if digest is not None and digest != current:
+            return "its inputs differ in the server, e.g. environment variables"
+        return None
+
+    def _collect(self, name, digest=None):
+        """Collect the data of `name` with the current sources of the scripts.
+
+        Returns None, or why the data was not collected, see `_stale`.
+        """
+        module = _import_current(name)
+        current, fixed = _fingerprints(module)
+        self._fixed.setdefault(name, fixed)
+        stale = self._stale(name, current, fixed, digest)
+        if stale is not None:
+            return stale
+        with stage(f"collect {name}"):
+            self._collected[name] = module.collect()
+        self._modules[name] = module
+        self._digests[name] = current
+        return None
+
+    def generate(self, names=None, refresh=False, digests=None):
+        """Render the outputs of `names`, collecting their data if needed.
+
+        `digests` maps generators to the current fingerprint of their inputs.
+        A generator whose fingerprint differs from the one recorded when its
+        data was collected is collected again with the current sources of
+        the scripts, unless inputs that the server cannot import again
+        changed, see :meth:`_stale`.
+
+        Returns a dict mapping each name to a result dict with the keys
+        ``ok``, ``seconds``, ``digest`` (the fingerprint the outputs were
+        rendered for), ``stale`` (None, or why the generator was not
+        rendered) and, on failure, ``error``.
+        """
+        digests = digests or {}
+        results = {}
+        for name in names or self.names:
+            start = time.perf_counter()
+            stale = None
+            digest = digests.get(name)
+            try:
+                if name not in self.names:
+                    raise ValueError(f"{name} is not served")
+                if (
+                    refresh
+                    or name not in self._collected
+                    or (digest is not None and digest != self._digests[name])
+                ):
+                    stale = self._collect(name, digest)
+                if stale is None:
+                    module = self._modules[name]
+                    with stage(f"render {name}"):
+                        module.render(self._collected[name])
+                    # render() does not write everything collect() does,
+                    # e.g. the preference screenshots
+                    missing = [
+                        path for path in module.OUTPUTS if not Path(path).exists()
+                    ]
+                    if missing:
+                        stale = f"{Path(missing[0]).name} is missing"
+            except Exception:
+                results[name] = {
+                    "ok": False,
+                    "seconds": time.perf_counter() - start,
+                    "digest": self._digests.get(name),
+                    "stale": None,
+                    "error": traceback.format_exc(),
+                }
+            else:
+                results[name] = {
+                    "ok": True,
+                    "seconds": time.perf_counter() - start,
+                    "digest": self._digests.get(name),
+                    "stale": stale,
+                }
+        return results
+
+    def handle(self, message):
+        """Answer one request, see :func:`request` for the commands."""
+        command = message.get("command")
+        if command == "generate":
+            return self.generate(
+                message.get("names"),
+                refresh=message.get("refresh", False),
+                digests=message.get("digests"),
+            )
+        if command == "status":
+            return {"served": self.names, "collected": list(self._collected)}
+        raise ValueError(f"unknown command {command!r}")
+
+    def serve_forever(self, state_file=STATE_FILE):
+        """Collect everything once, then answer requests until interrupted."""
+        # Qt generators render offscreen, the server never shows a window
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        for name, result in self.generate().items():
+            status = "ready" if result["ok"] else "failed"
+            print(f"{name}: {status} ({result['seconds']:.2f} s)")
+            if not result["ok"]:
+                print(result["error"])
+            elif result["stale"]:
+                print(f"{name}: not rendered, {result['stale']}")
+
+        authkey = secrets.token_bytes(32)
+        with Listener(("127.0.0.1", 0), authkey=authkey) as listener:
+            state_file.parent.mkdir(parents=True, exist_ok=True)
+            state_file.write_text(
+                json.dumps(
+                    {
+                        "address": list(listener.address),
+                        "authkey": authkey.hex(),
+                        "pid": os.getpid(),
+                    }
+                ),
+                encoding="utf-8",
+            )
+            os.chmod(state_file, 0o600)
+            print(f"Serving documentation generators on {listener.address}")
+            try:
+                while True:
+                    try:
+                        conn = listener.accept()
+                    except (AuthenticationError, EOFError, OSError):
+                        continue
+                    try:
+                        with conn:
+                            message = conn.recv()
+                            if message.get("command") == "shutdown":
+                                conn.send({"ok": True})
+                                break
+                            try:
+                                answer = {"ok": True, "result": self.handle(message)}
+                            except Exception:
+                                answer = {"ok": False, "error": traceback.format_exc()}
+                            conn.send(answer)
+                    except (EOFError, OSError) as err:
+                        # the client went away, keep serving the others
+                        print(f"Dropped a connection: {err!r}")
+            except KeyboardInterrupt:
+                pass
+            finally:
+                state_file.unlink(missing_ok=True)
+
+
+def request(command, state_file=STATE_FILE, **kwargs):
+    """Send a request to the running server and return its answer.
+
+    Commands are ``generate`` (optional ``names``, ``refresh`` and
+    ``digests``), ``status`` and ``shutdown``.
+    """
+    state = json.loads(Path(state_file).read_text(encoding="utf-8"))
+    with Client(
+        tuple(state["address"]), authkey=bytes.fromhex(state["authkey"])
+    ) as conn:
+        conn.send({"command": command, **kwargs})
+        answer = conn.recv()
+    if not answer["ok"]:
+        raise RuntimeError(answer["error"])
+    return answer.get("result")
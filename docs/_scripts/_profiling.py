@@ -0,0 +1,244 @@
+"""Timing and profiling of the documentation preparation pipeline.
+
+This module records how long each documentation generator, and each major
+step inside it, takes when ``prep_docs.py`` runs with ``--profile``. For every
+stage it stores the wall time, the CPU time, the peak resident set size of the
+process so far and how much the stage raised it, and optionally a cProfile
+dump that can be inspected with :mod:`pstats` or tools like snakeviz.
+
+The operating system only reports the peak RSS of the whole process. When
+several generators run in one process, ``process_peak_rss`` of a later stage
+includes the memory of the earlier ones; ``peak_rss_increase`` is the part
+the stage itself added, zero if it stayed below the earlier peak.
+
+Generators mark their steps with :func:`stage`, and frequently called helpers
+can be wrapped with :func:`timed` to accumulate their total cost. Both are
+no-ops unless profiling was enabled with :func:`enable`, so they can stay in
+the generators permanently.
+
+Reports are written to the profile directory as:
+
+- ``summary.json``: all stages and accumulated counters
+- ``trace.json``: Chrome trace-event file, open it in ``chrome://tracing``
+  or https://ui.perfetto.dev
+- ``<stage>.pstats``: cProfile output of the generators, with ``--cprofile``
+
+Example:
+    Mark a step in a generator::
+
+        >>> from _profiling import stage
+        >>> with stage("parse releases"):
+        ...     releases = parse_releases()
+
+    Enable profiling and write the reports::
+
+        >>> profiler = enable("docs/_build/prep_profile")
+        >>> main()
+        >>> profiler.write_reports()
+"""
+
+import cProfile
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from multiprocessing import current_process
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+_PROFILER = None
+
+
+def _peak_rss():
+    """Peak resident set size of the current process in bytes, if known."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _megabytes(size):
+    return size / 2**20 if size is not None else None
+
+
+def _slug(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+
+
+class Profiler:
+    """Collects timing records of the stages run in this process.
+
+    Parameters
+    ----------
+    output_dir : Path
+        Directory where reports and pstats files are written.
+    cprofile : bool, optional
+        Whether stages started with ``cprofile=True`` run under cProfile.
+    """
+
+    def __init__(self, output_dir, cprofile=False):
+        self.output_dir = Path(output_dir)
+        self.cprofile = cprofile
+        self.records = []
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name, category="stage", cprofile=False):
+        """Record the wall time, CPU time and peak RSS of the enclosed code."""
+        profile = cProfile.Profile() if cprofile and self.cprofile else None
+        start_peak = _peak_rss()
+        start = time.time()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            record = {
+                "name": name,
+                "category": category,
+                "process": current_process().name,
+                "pid": os.getpid(),
+                "start": start,
+                "wall": time.perf_counter() - wall,
+                "cpu": time.process_time() - cpu,
+                "process_peak_rss": _peak_rss(),
+                "peak_rss_increase": None,
+            }
+            if start_peak is not None:
+                record["peak_rss_increase"] = record["process_peak_rss"] - start_peak
+            if profile is not None:
+                self.output_dir.mkdir(parents=True, exist_ok=True)
+                pstats_path = self.output_dir / f"{_slug(name)}.pstats"
+                profile.dump_stats(pstats_path)
+                record["pstats"] = pstats_path.name
+            self.records.append(record)
+
+    @contextmanager
+    def count(self, name):
+        """Accumulate calls, wall time and CPU time of the enclosed code."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            counter = self.counters.setdefault(
+                name, {"calls": 0, "wall": 0.0, "cpu": 0.0}
+            )
+            counter["calls"] += 1
+            counter["wall"] += time.perf_counter() - wall
+            counter["cpu"] += time.process_time() - cpu
+
+    def save(self, path):
+        """Save the raw records, e.g. to hand them over from a subprocess."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"records": self.records, "counters": self.counters}),
+            encoding="utf-8",
+        )
+
+    def merge(self, path):
+        """Add the records saved by another process with :meth:`save`."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        self.records.extend(data["records"])
+        for name, counter in data["counters"].items():
+            total = self.counters.setdefault(
+                name, {"calls": 0, "wall": 0.0, "cpu": 0.0}
+            )
+            for key, value in counter.items():
+                total[key] += value
+
+    def trace_events(self):
+        """The records as Chrome trace-event "complete" events."""
+        events = []
+        processes = {}
+        for record in self.records:
+            processes[record["pid"]] = record["process"]
+            events.append(
+                {
+                    "name": record["name"],
+                    "cat": record["category"],
+                    "ph": "X",
+                    "ts": record["start"] * 1e6,
+                    "dur": record["wall"] * 1e6,
+                    "pid": record["pid"],
+                    "tid": 0,
+                    "args": {
+                        "cpu_ms": record["cpu"] * 1e3,
+                        "process_peak_rss_mb": _megabytes(record["process_peak_rss"]),
+                        "peak_rss_increase_mb": _megabytes(record["peak_rss_increase"]),
+                    },
+                }
+            )
+        for pid, process in processes.items():
+            events.append(
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": 0,
+                    "args": {"name": process},
+                }
+            )
+        return events
+
+    def write_reports(self):
+        """Write ``summary.json`` and ``trace.json`` to the output directory."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        summary = {
+            "stages": sorted(self.records, key=lambda r: r["start"]),
+            "counters": self.counters,
+        }
+        (self.output_dir / "summary.json").write_text(
+            json.dumps(summary, indent=2), encoding="utf-8"
+        )
+        trace = {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}
+        (self.output_dir / "trace.json").write_text(json.dumps(trace), encoding="utf-8")
+        print(f"Profile written to {self.output_dir}")
+
+
+def enable(output_dir, cprofile=False):
+    """Start profiling this process, returns the active :class:`Profiler`."""
+    global _PROFILER
+    _PROFILER = Profiler(output_dir, cprofile=cprofile)
+    return _PROFILER
+
+
+def active():
+    """The active :class:`Profiler`, or None if profiling is disabled."""
+    return _PROFILER
+
+
+def stage(name, category="stage", cprofile=False):
+    """Context manager recording a stage if profiling is enabled."""
+    if _PROFILER is None:
+        return nullcontext()
+    return _PROFILER.stage(name, category=category, cprofile=cprofile)
+
+
+def timed(name):
+    """Decorator accumulating the cost of every call if profiling is enabled."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _PROFILER is None:
+                return func(*args, **kwargs)
+            with _PROFILER.count(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,112 @@
+"""Registry of the documentation generators run by ``prep_docs.py``.
+
+Each generator is registered under a short name, used on the command line
+with ``--only`` and ``--skip``, together with the module implementing it and
+the generators that must run before it. The generator modules provide
+``main(stubs)``, ``OUTPUTS`` and ``fingerprint_inputs()``; ``npe2`` is the
+exception, it is implemented by ``prep_npe2`` in ``prep_docs.py``.
+
+Example:
+    Select the generators to run, in dependency order::
+
+        >>> [gen.name for gen in select(only=['events', 'release'])]
+        ['events', 'release']
+        >>> [gen.name for gen in select(skip=['preferences', 'npe2'])]
+        ['events', 'ui_sections', 'release']
+
+Attributes:
+    REGISTRY (dict): Registered generators by name, in registration order
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+REGISTRY = {}
+
+
+@dataclass(frozen=True)
+class Generator:
+    """A registered documentation generator.
+
+    Attributes
+    ----------
+    name : str
+        Short name, used on the command line.
+    module : str or None
+        Module implementing the generator.
+    requires : tuple of str
+        Generators that must run before this one.
+    qt : bool
+        Whether the generator creates a QApplication.
+    stub_runs_full : bool
+        Whether the full generation is cheap enough to also run in stubs mode.
+    """
+
+    name: str
+    module: Optional[str]
+    requires: Tuple[str, ...] = ()
+    qt: bool = False
+    stub_runs_full: bool = False
+
+
+def register(name, module, requires=(), qt=False, stub_runs_full=False):
+    """Add a generator to the registry and return it."""
+    for required in requires:
+        if required not in REGISTRY:
+            raise ValueError(f"{name} requires unknown generator {required!r}")
+    REGISTRY[name] = Generator(
+        name, module, tuple(requires), qt=qt, stub_runs_full=stub_runs_full
+    )
+    return REGISTRY[name]
+
+
+def select(only=None, skip=None):
+    """Return the generators to run, dependencies first.
+
+    Parameters
+    ----------
+    only : iterable of str, optional
+        Names of the generators to run, together with the generators they
+        require. All generators if not given.
+    skip : iterable of str, optional
+        Names of generators not to run, even if required by another one.
+
+    Returns
+    -------
+    list of Generator
+        The selected generators in an order satisfying their requirements,
+        otherwise in registration order.
+    """
+    only = list(REGISTRY) if only is None else list(only)
+    skip = set(skip or ())
+    unknown = (set(only) | skip) - set(REGISTRY)
+    if unknown:
+        raise ValueError(
+            f"Unknown generators: {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(REGISTRY)}"
+        )
+
+    ordered = []
+    visiting = set()
+
+    def visit(name):
+        if name in skip or name in ordered:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle involving {name!r}")
+        visiting.add(name)
+        for required in REGISTRY[name].requires:
+            visit(required)
+        visiting.discard(name)
+        ordered.append(name)
+
+    for name in sorted(only, key=list(REGISTRY).index):
+        visit(name)
+    return [REGISTRY[name] for name in ordered]
+
+
+register("npe2", None)
+register("preferences", "update_preference_docs", qt=True)
+register("events", "update_event_docs")
+register("ui_sections", "update_ui_sections_docs")
+register("release", "update_release_docs", stub_runs_full=True)
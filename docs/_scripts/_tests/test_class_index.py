@@ -0,0 +1,81 @@
+import textwrap
+
+from _class_index import ClassIndex
+
+SOURCES = {
+    "__init__.py": "from .models import Camera\n",
+    "events.py": """
+        class EventedModel:
+            pass
+
+        class EmitterGroup:
+            pass
+        """,
+    "models.py": """
+        from .events import EventedModel as Base
+        from .events import EmitterGroup
+
+        class Camera(Base):
+            def __init__(self):
+                self.events = EmitterGroup(source=self, zoom=None)
+                self.events.add(angles=None)
+                self.layer.events.add(other=None)
+
+        class Plain:
+            pass
+        """,
+    "sub/__init__.py": "",
+    "sub/dims.py": """
+        import pkg
+
+        class Dims(pkg.Camera):
+            pass
+        """,
+    "_tests/test_models.py": """
+        from pkg.events import EventedModel
+
+        class FakeModel(EventedModel):
+            pass
+        """,
+}
+
+
+def _build(tmp_path):
+    root = tmp_path / "pkg"
+    for name, source in SOURCES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(source))
+    return ClassIndex.build("pkg", root=root, cache_path=tmp_path / "index.json")
+
+
+def test_subclasses_through_imports(tmp_path):
+    index = _build(tmp_path)
+    assert index.subclasses("pkg.events.EventedModel") == [
+        ("pkg.events", "EventedModel"),
+        ("pkg.models", "Camera"),
+        ("pkg.sub.dims", "Dims"),
+    ]
+    # re-exported names resolve to the defining module
+    assert index.subclasses("pkg.Camera") == [
+        ("pkg.models", "Camera"),
+        ("pkg.sub.dims", "Dims"),
+    ]
+
+
+def test_emitters_of_a_class(tmp_path):
+    index = _build(tmp_path)
+    assert [
+        (call["call"], call["names"]) for call in index.emitters("pkg.models", "Camera")
+    ] == [("EmitterGroup", ["source", "zoom"]), ("add", ["angles"])]
+    assert index.emitters("pkg.models", "Plain") == []
+    assert index.emitters("pkg.missing") == []
+
+
+def test_cached_index_is_reused(tmp_path):
+    first = _build(tmp_path)
+    assert (tmp_path / "index.json").exists()
+    again = ClassIndex.build(
+        "pkg", root=tmp_path / "pkg", cache_path=tmp_path / "index.json"
+    )
+    assert again.modules == first.modules
@@ -0,0 +1,31 @@
+from _disk_cache import DiskCache
+
+
+def test_get_checks_digest(tmp_path):
+    cache = DiskCache(tmp_path / "cache.json")
+    cache.set("Image", "abc", {"data": "The image data."})
+    assert cache.get("Image", "abc") == {"data": "The image data."}
+    assert cache.get("Image", "def") is None
+    assert cache.get("Labels", "abc") is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path / "cache.json", max_entries=2)
+    cache.set("a", "1", "A")
+    cache.set("b", "1", "B")
+    assert cache.get("a", "1") == "A"
+    cache.set("c", "1", "C")
+    assert len(cache) == 2
+    assert cache.get("b", "1") is None
+    assert cache.get("a", "1") == "A"
+    assert cache.get("c", "1") == "C"
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = DiskCache(path)
+    cache.set("a", "1", ["x"])
+    cache.save()
+    assert DiskCache(path).get("a", "1") == ["x"]
+    path.write_text("not json")
+    assert len(DiskCache(path)) == 0
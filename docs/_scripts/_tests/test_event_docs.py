@@ -0,0 +1,53 @@
+from update_event_docs import diff_catalogs, group_layer_rows
+
+
+def test_group_layer_rows():
+    rows = [
+        ["`Image`", "data", "The data changed.", "None"],
+        ["`Points`", "shading", "Points shading.", "str"],
+        ["`Labels`", "data", "The data changed.", "None"],
+        ["`Surface`", "shading", "Surface shading.", "str"],
+        ["`Image`", "data", "The data changed.", "None"],
+    ]
+    assert group_layer_rows(rows) == [
+        ["`Image`, `Labels`", "data", "The data changed.", "None"],
+        ["`Points`", "shading", "Points shading.", "str"],
+        ["`Surface`", "shading", "Surface shading.", "str"],
+    ]
+
+
+def _event(cls, access, description="", type="None"):
+    return {
+        "table": "layer",
+        "class": cls,
+        "access": access,
+        "description": description,
+        "type": type,
+    }
+
+
+def test_diff_catalogs():
+    old = {
+        "napari": "0.5.0",
+        "events": [
+            _event("Image", "layer.events.data", "Data."),
+            _event("Image", "layer.events.gamma"),
+        ],
+    }
+    new = {
+        "napari": "0.5.1",
+        "events": [
+            _event("Image", "layer.events.data", "The data changed."),
+            _event("Image", "layer.events.contrast_limits"),
+        ],
+    }
+    diff = diff_catalogs(old, new)
+    assert diff["added"] == [_event("Image", "layer.events.contrast_limits")]
+    assert diff["removed"] == [_event("Image", "layer.events.gamma")]
+    assert diff["changed"] == [
+        (
+            _event("Image", "layer.events.data", "Data."),
+            _event("Image", "layer.events.data", "The data changed."),
+        )
+    ]
+    assert diff_catalogs(new, new) == {"added": [], "removed": [], "changed": []}
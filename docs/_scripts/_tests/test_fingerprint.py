@@ -0,0 +1,24 @@
+import _fingerprint
+
+
+def test_overwritten_output_is_outdated(tmp_path):
+    output = tmp_path / "_layer_events.md"
+    output.write_text("full table")
+    manifest = {}
+    _fingerprint.record(manifest, "gen", "digest", [output])
+    assert _fingerprint.is_up_to_date(manifest, "gen", "digest", [output])
+    assert not _fingerprint.is_up_to_date(manifest, "gen", "other", [output])
+
+    # e.g. prep_docs.py --stubs writes a stub over the generated file
+    output.write_text("stub")
+    assert not _fingerprint.is_up_to_date(manifest, "gen", "digest", [output])
+
+    output.unlink()
+    assert not _fingerprint.is_up_to_date(manifest, "gen", "digest", [output])
+
+
+def test_manifest_without_output_hashes_is_outdated(tmp_path):
+    output = tmp_path / "out.md"
+    output.write_text("text")
+    manifest = {"gen": {"fingerprint": "digest", "outputs": ["out.md"]}}
+    assert not _fingerprint.is_up_to_date(manifest, "gen", "digest", [output])
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from _output import open_text, write_bytes, write_text
+
+
+def _age(path):
+    """Set the modification time of `path` in the past, return it."""
+    os.utime(path, ns=(10**9, 10**9))
+    return path.stat().st_mtime_ns
+
+
+def test_write_bytes_keeps_identical_file(tmp_path):
+    path = tmp_path / "page.md"
+    assert write_bytes(path, b"table")
+    mtime = _age(path)
+    assert not write_bytes(path, b"table")
+    assert not write_text(path, "table")
+    assert path.stat().st_mtime_ns == mtime
+
+    assert write_bytes(path, b"other table")
+    assert path.read_bytes() == b"other table"
+    assert path.stat().st_mtime_ns != mtime
+    assert [p.name for p in tmp_path.iterdir()] == ["page.md"]
+
+
+def test_open_text_keeps_identical_file(tmp_path):
+    path = tmp_path / "page.md"
+    with open_text(path) as stream:
+        stream.write("line\n" * 1000)
+    mtime = _age(path)
+    with open_text(path) as stream:
+        stream.write("line\n" * 1000)
+    assert path.stat().st_mtime_ns == mtime
+
+    with open_text(path) as stream:
+        stream.write("line\n" * 999)
+    assert path.read_text() == "line\n" * 999
+    assert path.stat().st_mtime_ns != mtime
+
+
+def test_open_text_leaves_file_on_error(tmp_path):
+    path = tmp_path / "page.md"
+    path.write_text("old")
+    with pytest.raises(RuntimeError):
+        with open_text(path) as stream:
+            stream.write("partial")
+            raise RuntimeError
+    assert path.read_text() == "old"
+    assert [p.name for p in tmp_path.iterdir()] == ["page.md"]
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from update_preference_docs import _stable_default
+
+SCRIPTS = Path(__file__).resolve().parent.parent
+
+
+class KeyBinding:
+    """Stands for napari's KeyBinding, whose repr includes its address."""
+
+    def __init__(self, keys):
+        self.keys = keys
+
+    def __str__(self):
+        return self.keys
+
+
+def test_stable_default():
+    default = {"copy": [KeyBinding("Ctrl+Shift+C")], "tags": {"b", "a"}}
+    assert json.dumps(default, sort_keys=True, default=_stable_default) == (
+        '{"copy": ["Ctrl+Shift+C"], "tags": ["a", "b"]}'
+    )
+
+
+def _run(code):
+    # a fresh process, with its own object addresses and hash seed
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SCRIPTS,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def test_image_cache_key_is_stable_across_processes():
+    pytest.importorskip("napari")
+    pytest.importorskip("qtpy")
+    code = "import update_preference_docs as u; print(u.image_cache_key())"
+    assert _run(code) == _run(code)
+
+
+def test_image_cache_key_does_not_import_napari_qt():
+    pytest.importorskip("napari")
+    pytest.importorskip("qtpy")
+    code = (
+        "import sys, update_preference_docs as u; u.image_cache_key(); "
+        "print(any(m.startswith('napari._qt') for m in sys.modules))"
+    )
+    assert _run(code) == "False\n"
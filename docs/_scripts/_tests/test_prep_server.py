@@ -0,0 +1,84 @@
+import sys
+import textwrap
+
+import pytest
+
+import _fingerprint
+import _prep_server
+
+GENERATOR = """
+    from pathlib import Path
+
+    import gen_helper
+
+    ROOT = Path(__file__).parent
+    OUTPUTS = [ROOT / "out.md"]
+
+
+    def fingerprint_inputs():
+        return {"paths": [Path(__file__), ROOT / "gen_helper.py", NAPARI]}
+
+
+    def collect():
+        return NAPARI.read_text()
+
+
+    def render(data):
+        OUTPUTS[0].write_text(gen_helper.TITLE + data)
+    """
+
+
+@pytest.fixture
+def scripts(tmp_path, monkeypatch):
+    """A scripts directory with a served generator and a helper it imports,
+    and a file outside of it standing for the napari sources."""
+    napari = tmp_path / "napari.py"
+    napari.write_text("events")
+    scripts = tmp_path / "scripts"
+    scripts.mkdir()
+    scripts.joinpath("gen.py").write_text(
+        f"NAPARI = __import__('pathlib').Path({str(napari)!r})\n"
+        + textwrap.dedent(GENERATOR)
+    )
+    scripts.joinpath("gen_helper.py").write_text("TITLE = 'v1 '\n")
+    monkeypatch.setattr(_prep_server, "SCRIPTS", scripts)
+    monkeypatch.syspath_prepend(str(scripts))
+    # sources are edited within the same second, never use stale bytecode
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    yield scripts
+    for name in ("gen", "gen_helper"):
+        sys.modules.pop(name, None)
+
+
+def _digest(scripts, napari):
+    _fingerprint.path_digest.cache_clear()
+    return _fingerprint.fingerprint(
+        paths=[scripts / "gen.py", scripts / "gen_helper.py", napari]
+    )
+
+
+def test_scripts_are_imported_again(scripts):
+    server = _prep_server.PrepServer(["gen"])
+    assert server.generate()["gen"]["stale"] is None
+    assert (scripts / "out.md").read_text() == "v1 events"
+
+    scripts.joinpath("gen_helper.py").write_text("TITLE = 'v2 '\n")
+    digest = _digest(scripts, scripts.parent / "napari.py")
+    result = server.generate(digests={"gen": digest})["gen"]
+    assert result["ok"] and result["stale"] is None
+    assert result["digest"] == digest
+    assert (scripts / "out.md").read_text() == "v2 events"
+
+
+def test_other_inputs_are_stale(scripts):
+    server = _prep_server.PrepServer(["gen"])
+    server.generate()
+    napari = scripts.parent / "napari.py"
+    napari.write_text("other events")
+    result = server.generate(digests={"gen": _digest(scripts, napari)})["gen"]
+    assert result["ok"]
+    assert "changed since the server started" in result["stale"]
+    assert (scripts / "out.md").read_text() == "v1 events"
+
+    # a wrong fingerprint is not taken as the one of the collected data
+    assert server.generate(digests={"gen": "other"})["gen"]["stale"]
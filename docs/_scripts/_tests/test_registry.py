@@ -0,0 +1,88 @@
+import textwrap
+
+import pytest
+
+import _registry
+import prep_docs
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """An empty generator registry, restored after the test."""
+    monkeypatch.setattr(_registry, "REGISTRY", {})
+    return _registry.REGISTRY
+
+
+def _write_generator(path, name, log, seconds=0.0, fail=False):
+    path.joinpath(f"{name}.py").write_text(
+        textwrap.dedent(
+            f"""
+            import time
+
+            def main(stubs=False):
+                time.sleep({seconds})
+                if {fail}:
+                    raise SystemExit(1)
+                with open({str(log)!r}, "a") as f:
+                    f.write("{name}\\n")
+            """
+        )
+    )
+
+
+def test_select_orders_requirements(registry):
+    _registry.register("slow", "gen_slow")
+    _registry.register("fast", "gen_fast", requires=["slow"])
+    _registry.register("other", "gen_other")
+    _registry.register("last", "gen_last", requires=["fast"])
+
+    assert [gen.name for gen in _registry.select()] == ["slow", "fast", "other", "last"]
+    assert [gen.name for gen in _registry.select(only=["last"])] == [
+        "slow",
+        "fast",
+        "last",
+    ]
+    assert [gen.name for gen in _registry.select(skip=["fast"])] == [
+        "slow",
+        "other",
+        "last",
+    ]
+
+
+def test_register_unknown_requirement(registry):
+    with pytest.raises(ValueError, match="unknown generator"):
+        _registry.register("fast", "gen_fast", requires=["slow"])
+
+
+def test_run_parallel_waits_for_requirements(registry, tmp_path, monkeypatch):
+    log = tmp_path / "log"
+    _write_generator(tmp_path, "gen_slow", log, seconds=0.5)
+    _write_generator(tmp_path, "gen_fast", log)
+    _write_generator(tmp_path, "gen_other", log)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    _registry.register("slow", "gen_slow")
+    _registry.register("fast", "gen_fast", requires=["slow"])
+    _registry.register("other", "gen_other")
+
+    names = [gen.module for gen in _registry.select()]
+    results = prep_docs.run_parallel(names, jobs=3)
+
+    assert results == dict.fromkeys(names, True)
+    order = log.read_text().split()
+    assert order.index("gen_slow") < order.index("gen_fast")
+    # unrelated generators do not wait
+    assert order.index("gen_other") < order.index("gen_slow")
+
+
+def test_run_parallel_skips_after_failed_requirement(registry, tmp_path, monkeypatch):
+    log = tmp_path / "log"
+    _write_generator(tmp_path, "gen_broken", log, fail=True)
+    _write_generator(tmp_path, "gen_fast", log)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    _registry.register("broken", "gen_broken")
+    _registry.register("fast", "gen_fast", requires=["broken"])
+
+    results = prep_docs.run_parallel(["gen_broken", "gen_fast"], jobs=2)
+
+    assert results == {"gen_broken": False, "gen_fast": False}
+    assert not log.exists()
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from _table_maker import STYLES, Table, table_repr, write_table  # noqa: E402
+
+HEADER = ["Event", "Description", "Type"]
+ROWS = [
+    ["theme", "Theme changed", "str"],
+    ["title", "Title of the viewer changed", "str"],
+    ["x", "", "int"],
+]
+
+
+@pytest.mark.parametrize("style", list(STYLES))
+@pytest.mark.parametrize("divide_rows", [False, True])
+def test_render_matches_table_repr(style, divide_rows):
+    table = Table.from_rows(ROWS, header=HEADER)
+    assert table.render(style, divide_rows=divide_rows) == table_repr(
+        ROWS, header=HEADER, style=style, divide_rows=divide_rows
+    )
+
+
+@pytest.mark.parametrize("divide_rows", [False, True])
+def test_write_table_matches_table_repr(monkeypatch, divide_rows):
+    monkeypatch.setattr("_table_maker._CHUNK_ROWS", 2)
+    expected = table_repr(ROWS, header=HEADER, divide_rows=divide_rows)
+    for rows in (ROWS, iter(ROWS)):  # iterators are spilled to disk
+        stream = io.StringIO()
+        assert write_table(rows, stream, header=HEADER, divide_rows=divide_rows) == 3
+        assert stream.getvalue() == expected
+    stream = io.StringIO()
+    write_table(iter(ROWS), stream, style="double")
+    assert stream.getvalue() == table_repr(ROWS, style="double")
+
+
+def test_write_table_without_rows():
+    stream = io.StringIO()
+    assert write_table(iter([]), stream, header=HEADER) == 0
+    assert stream.getvalue() == table_repr([], header=HEADER) == ""
+
+
+def test_write_in_chunks(monkeypatch):
+    monkeypatch.setattr("_table_maker._CHUNK_ROWS", 2)
+    rows = [[str(i), f"event {i}", "None"] for i in range(5)]
+    stream = io.StringIO()
+    Table.from_rows(rows, header=HEADER).write(stream)
+    assert stream.getvalue() == table_repr(rows, header=HEADER, divide_rows=False)
+
+
+def test_sort_and_pages():
+    table = Table.from_rows(ROWS, header=HEADER).sort("Type", reverse=True)
+    assert [row[0] for row in table.rows()] == ["theme", "title", "x"]
+    pages = table.pages(1, by="Type")
+    assert [(title, len(page)) for title, page in pages] == [
+        ("str", 1),
+        ("str (2)", 1),
+        ("int", 1),
+    ]
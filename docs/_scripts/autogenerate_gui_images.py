@@ -62,6 +62,7 @@ The output was reviewed and edited for accuracy and clarity.
 
 from pathlib import Path
 
+from _output import save_pixmap
 from qtpy.QtCore import QTimer, QPoint, QRect
 import napari
 
@@ -300,7 +301,7 @@ def capture_popups(config):
     app.processEvents()
 
     pixmap = popup.grab()
-    pixmap.save(str(POPUPS_PATH / f"{config['name']}.png"))
+    save_pixmap(pixmap, POPUPS_PATH / f"{config['name']}.png")
     popup.close()
     app.processEvents()
 
@@ -310,7 +311,7 @@ def capture_widget(widget, name):
         return print(f"Could not find {name}")
 
     pixmap = widget.grab()
-    pixmap.save(str(WIDGETS_PATH / f"{name}.png"))
+    save_pixmap(pixmap, WIDGETS_PATH / f"{name}.png")
     return
 
 def capture_menu(menu, name):
@@ -321,7 +322,7 @@ def capture_menu(menu, name):
     menu.popup(menu.parent().mapToGlobal(menu.pos()))
 
     pixmap = menu.grab()
-    pixmap.save(str(MENUS_PATH / f"{name}.png"))
+    save_pixmap(pixmap, MENUS_PATH / f"{name}.png")
     menu.hide()
     return
 
@@ -372,7 +373,7 @@ def capture_viewer_region(viewer, component_names, save_name):
     app.processEvents()
     screen = QApplication.primaryScreen()
     pixmap = screen.grabWindow(0, region.x(), region.y(), region.width(), region.height())
-    pixmap.save(str(REGION_PATH / f"{save_name}.png"))
+    save_pixmap(pixmap, REGION_PATH / f"{save_name}.png")
 
 def close_all(viewer):
     viewer.close()
@@ -0,0 +1,488 @@
+"""Benchmarks for the documentation generation scripts.
+
+This script measures how the helper functions used by the documentation
+generators perform and scale, using synthetic inputs only: no napari import,
+no network and no Qt are needed. For every function and input size it records
+the median and best wall time over several runs and the peak memory allocated
+during one run (measured with :mod:`tracemalloc`).
+
+Results can be saved as JSON and compared against a stored baseline. Timings
+are normalised by a short calibration loop run on the same machine, so that a
+baseline recorded on another machine is still meaningful. The script exits
+with status 1 if a benchmark became slower, or allocates more memory, than
+the baseline by more than the given threshold, so it can fail a CI job.
+
+Benchmarked functions:
+    - ``_table_maker.table_repr``: tables of 100 to 10k rows
+    - ``_table_maker.write_table``: tables of 1k to 100k rows streamed from
+      an iterator to a file
+    - ``update_event_docs.write_event_table``: a layer events table paged
+      per class into include files of at most 150 rows, 1k to 100k rows
+    - ``_table_maker.Table``: one table sorted, then rendered to Markdown,
+      MyST list-table and CSV, 1k to 100k rows
+    - ``update_release_docs.parse_releases``: 100 to 5000 release files
+    - ``update_ui_sections_docs.generate_mermaid_diagram``: graphs of 100 to
+      5000 modules
+    - ``update_ui_sections_docs.generate_directory_layout``: deep fake module
+      trees of 100 to 500 files
+    - ``update_event_docs.group_layer_rows``: 1k to 100k rows
+    - ``update_event_docs.class_doc_attrs``: docstrings with 10 to 1000
+      documented attributes
+
+The baseline of the CI job is ``benchmark_baseline.json``, next to this
+script; the job fails on a 2x regression. Record it again when a change is
+expected to make a benchmark slower, or after adding one.
+
+Usage:
+    Run all benchmarks and save the results as the new baseline::
+
+        $ python docs/_scripts/benchmark_scripts.py --output docs/_scripts/benchmark_baseline.json
+
+    Compare against the baseline, failing on a 50% regression::
+
+        $ python docs/_scripts/benchmark_scripts.py --baseline docs/_scripts/benchmark_baseline.json --threshold 1.5
+
+    Run only some benchmarks::
+
+        $ python docs/_scripts/benchmark_scripts.py --only table_repr,parse_releases
+
+Attributes:
+    BENCHMARKS (dict): Registered benchmarks, mapping their name to the input
+        sizes and the setup function
+"""
+
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes):
+    """Register a benchmark setup function for the given input sizes.
+
+    The decorated function is called as ``setup(size, tmp_path)`` and must
+    return a callable without arguments that runs the benchmarked code.
+    Benchmarks whose optional dependencies are missing are skipped.
+    """
+
+    def decorator(setup):
+        BENCHMARKS[name] = (tuple(sizes), setup)
+        return setup
+
+    return decorator
+
+
+class _FakeDepGraph:
+    """Stand-in for a pydeps DepGraph, whose `str` is the JSON of its modules."""
+
+    def __init__(self, modules):
+        self._json = json.dumps(modules)
+
+    def __str__(self):
+        return self._json
+
+
+def _fake_module_tree(root, n_files, depth=6, fanout=4):
+    """Create `n_files` empty modules spread over a tree of packages."""
+    files = []
+    for i in range(n_files):
+        parts = []
+        index = i
+        for level in range(depth):
+            parts.append(f"pkg{level}_{index % fanout}")
+            index //= fanout
+        path = Path(root, *parts, f"module_{i}.py")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        files.append(path)
+    return files
+
+
+@benchmark("table_repr", sizes=(100, 1_000, 10_000))
+def bench_table_repr(size, tmp_path):
+    from _table_maker import table_repr
+
+    header = ["Class", "Event", "Description", "Event.value type"]
+    rows = [
+        [
+            f"`Layer{i % 13}`",
+            f"`layer.events.event_{i}`",
+            "Description of the event. " * (i % 5 + 1),
+            "`int`",
+        ]
+        for i in range(size)
+    ]
+    return lambda: table_repr(rows, padding=2, header=header, divide_rows=False)
+
+
+@benchmark("write_table", sizes=(1_000, 10_000, 100_000))
+def bench_write_table(size, tmp_path):
+    from _table_maker import write_table
+
+    header = ["Class", "Event", "Description", "Event.value type"]
+
+    def rows():
+        # an iterator, so the rows are spilled to disk in the first pass
+        for i in range(size):
+            yield [
+                f"`Layer{i % 13}`",
+                f"`layer.events.event_{i}`",
+                "Description of the event. " * (i % 5 + 1),
+                "`int`",
+            ]
+
+    def run():
+        with open(tmp_path / "table.md", "w", encoding="utf-8") as stream:
+            write_table(rows(), stream, header=header, divide_rows=False)
+
+    return run
+
+
+@benchmark("write_event_table", sizes=(1_000, 10_000, 100_000))
+def bench_write_event_table(size, tmp_path):
+    from _table_maker import Table
+    from update_event_docs import write_event_table
+
+    table = Table.from_rows(
+        (
+            [
+                f"`Layer{i % 13}`",
+                f"`layer.events.event_{i}`",
+                "Description of the event. " * (i % 5 + 1),
+                "",
+            ]
+            for i in range(size)
+        ),
+        header=["Class", "Event", "Description", "Event.value type"],
+    )
+    path = tmp_path / "_layer_events.md"
+
+    def run():
+        for page in tmp_path.glob("*.md"):
+            page.unlink()  # measure the writes, not the comparisons
+        write_event_table(table, path, "Class", max_rows=150)
+
+    return run
+
+
+@benchmark("Table", sizes=(1_000, 10_000, 100_000))
+def bench_table(size, tmp_path):
+    from _table_maker import Table
+
+    table = Table.from_rows(
+        (
+            [
+                f"`Layer{i % 13}`",
+                f"`layer.events.event_{i}`",
+                "Description of the event. " * (i % 5 + 1),
+                "`int`",
+            ]
+            for i in range(size)
+        ),
+        header=["Class", "Event", "Description", "Event.value type"],
+    )
+
+    def run():
+        ordered = table.sort("Class")
+        for format in ("markdown", "list-table", "csv"):
+            ordered.render(format)
+
+    return run
+
+
+@benchmark("parse_releases", sizes=(100, 1_000, 5_000))
+def bench_parse_releases(size, tmp_path):
+    import update_release_docs
+
+    for i in range(size):
+        version = f"0_{i // 10}_{i % 10}"
+        (tmp_path / f"release_{version}.md").write_text(
+            f"# napari 0.{i // 10}.{i % 10}\n\n"
+            f"*Thursday, Jul {i % 28 + 1:02d}, {2000 + i % 25}*\n\n"
+            "## Highlights\n\n"
+            + "".join(f"- Highlight {j} of release {i}\n" for j in range(10))
+            + "\n## New Features\n\n"
+            + "".join(f"- Feature {j} ([#{j}](url))\n" for j in range(50)),
+            encoding="utf-8",
+        )
+
+    def run():
+        original = update_release_docs.RELEASE_PATH
+        update_release_docs.RELEASE_PATH = tmp_path
+        try:
+            update_release_docs.parse_releases()
+        finally:
+            update_release_docs.RELEASE_PATH = original
+
+    return run
+
+
+def _fake_dep_graph(root, size):
+    files = _fake_module_tree(root, size)
+    modules = {}
+    names = []
+    for i, path in enumerate(files):
+        name = ".".join(path.relative_to(root).with_suffix("").parts)
+        names.append(name)
+        modules[name] = {
+            "name": name,
+            "path": str(path),
+            # a few imports of earlier modules, like a real package
+            "imports": names[max(0, i - 4) : i],
+        }
+    return _FakeDepGraph(modules)
+
+
+@benchmark("generate_mermaid_diagram", sizes=(100, 1_000, 5_000))
+def bench_generate_mermaid_diagram(size, tmp_path):
+    import update_ui_sections_docs as ui
+
+    graph = _fake_dep_graph(tmp_path, size)
+
+    def run():
+        original = ui.NAPARI_ROOT_DIRECTORY_PATH
+        ui.NAPARI_ROOT_DIRECTORY_PATH = tmp_path
+        try:
+            ui.generate_mermaid_diagram(
+                graph,
+                graph_node_default_style="fill:#00c3ff,color:black;",
+                graph_node_external_style="fill:#ffa600,color:black;",
+                graph_link_default_style="stroke:#00c3ff",
+                graph_urls_prefix="https://github.com/napari/napari/tree/main/napari/",
+                graph_title="Benchmark",
+                graph_description="Synthetic dependency graph",
+            )
+        finally:
+            ui.NAPARI_ROOT_DIRECTORY_PATH = original
+
+    return run
+
+
+@benchmark("generate_directory_layout", sizes=(100, 250, 500))
+def bench_generate_directory_layout(size, tmp_path):
+    import seedir  # noqa: F401, skip the benchmark if missing
+    import update_ui_sections_docs as ui
+
+    graph = _fake_dep_graph(tmp_path, size)
+    return lambda: ui.generate_directory_layout(graph, root_directory=tmp_path)
+
+
+@benchmark("group_layer_rows", sizes=(1_000, 10_000, 100_000))
+def bench_group_layer_rows(size, tmp_path):
+    from update_event_docs import group_layer_rows
+
+    classes = ["Image", "Labels", "Surface", "Points", "Shapes", "Tracks"]
+    rows = [
+        [
+            f"`{classes[i % len(classes)]}`",
+            f"`layer.events.event_{(i // len(classes)) % (size // 10 + 1)}`",
+            "Description of the event.",
+            "",
+        ]
+        for i in range(size)
+    ]
+    return lambda: group_layer_rows(rows)
+
+
+@benchmark("class_doc_attrs", sizes=(10, 100, 1_000))
+def bench_class_doc_attrs(size, tmp_path):
+    import numpydoc  # noqa: F401, skip the benchmark if missing
+    import update_event_docs
+    from _disk_cache import DiskCache
+
+    doc = "Synthetic class.\n\nParameters\n----------\n"
+    doc += "".join(
+        f"param_{i} : int\n    Description of parameter {i}.\n" for i in range(size)
+    )
+    doc += "\nAttributes\n----------\n"
+    doc += "".join(
+        f"attr_{i} : str\n    Description of attribute {i}.\n" for i in range(size)
+    )
+    kls = type("Synthetic", (), {"__doc__": doc})
+
+    def run():
+        # measure the parsing, not the in-process and on-disk caches
+        update_event_docs.class_doc_attrs.__wrapped__.cache_clear()
+        original = update_event_docs._class_doc_cache
+        update_event_docs._class_doc_cache = lambda: DiskCache(
+            tmp_path / "class_docs.json"
+        )
+        try:
+            update_event_docs.class_doc_attrs(kls)
+        finally:
+            update_event_docs._class_doc_cache = original
+
+    return run
+
+
+def measure(func, repeat=5):
+    """Time `func` `repeat` times and record its peak traced memory once."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "median": statistics.median(times),
+        "min": min(times),
+        "peak_bytes": peak,
+    }
+
+
+def calibrate(repeat=5):
+    """Median time of a fixed pure Python loop, to compare machines."""
+    return measure(lambda: sum(i * i for i in range(300_000)), repeat)["median"]
+
+
+def run(names=None, repeat=5):
+    """Run the benchmarks `names` (all by default) at every input size.
+
+    Returns a dict with the calibration time and, for each benchmark and
+    size, the measurement of :func:`measure` under the key ``name[size]``.
+    """
+    results = {"calibration": calibrate(repeat), "benchmarks": {}}
+    for name in names or BENCHMARKS:
+        sizes, setup = BENCHMARKS[name]
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                try:
+                    func = setup(size, Path(tmp))
+                except ImportError as err:
+                    print(f"{name}: skipped, {err}")
+                    break
+                result = measure(func, repeat)
+            result.update(name=name, size=size)
+            results["benchmarks"][f"{name}[{size}]"] = result
+    return results
+
+
+def compare(results, baseline, threshold=1.5):
+    """Find benchmarks that regressed compared to `baseline`.
+
+    Times are scaled by the ratio of the calibration times, memory is
+    compared directly. A benchmark regresses if it takes more than
+    `threshold` times the baseline time, or allocates more than `threshold`
+    times the baseline memory (ignoring differences below 1 MiB).
+
+    Returns a dict mapping ``name[size]`` to the time and memory ratios of
+    every benchmark in both results, and the list of regressed keys.
+    """
+    scale = results["calibration"] / baseline["calibration"]
+    ratios = {}
+    regressions = []
+    for key, result in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(key)
+        if base is None:
+            continue
+        time_ratio = result["median"] / (base["median"] * scale)
+        memory_ratio = result["peak_bytes"] / max(base["peak_bytes"], 1)
+        ratios[key] = (time_ratio, memory_ratio)
+        if time_ratio > threshold or (
+            memory_ratio > threshold
+            and result["peak_bytes"] - base["peak_bytes"] > 2**20
+        ):
+            regressions.append(key)
+    return ratios, regressions
+
+
+def report(results, ratios=None):
+    """Format the results as a table."""
+    from _table_maker import table_repr
+
+    header = ["Benchmark", "Size", "Median (ms)", "Min (ms)", "Peak (MiB)"]
+    if ratios is not None:
+        header += ["Time vs baseline", "Memory vs baseline"]
+    rows = []
+    for key, result in results["benchmarks"].items():
+        row = [
+            result["name"],
+            str(result["size"]),
+            f"{result['median'] * 1e3:.2f}",
+            f"{result['min'] * 1e3:.2f}",
+            f"{result['peak_bytes'] / 2**20:.2f}",
+        ]
+        if ratios is not None:
+            time_ratio, memory_ratio = ratios.get(key, (None, None))
+            row += [
+                f"{time_ratio:.2f}x" if time_ratio is not None else "new",
+                f"{memory_ratio:.2f}x" if memory_ratio is not None else "new",
+            ]
+        rows.append(row)
+    return table_repr(rows, padding=1, header=header, divide_rows=False)
+
+
+def main(names=None, repeat=5, output=None, baseline=None, threshold=1.5):
+    """Run, report and optionally save and compare the benchmarks.
+
+    Returns the process exit status: 1 if any benchmark regressed.
+    """
+    results = run(names, repeat)
+    ratios = regressions = None
+    if baseline is not None:
+        ratios, regressions = compare(
+            results,
+            json.loads(Path(baseline).read_text(encoding="utf-8")),
+            threshold,
+        )
+    print(report(results, ratios))
+    if output is not None:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if regressions:
+        print(f"Regressions above {threshold}x: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the documentation generation scripts."
+    )
+    parser.add_argument(
+        "--only",
+        type=lambda value: [name for name in value.split(",") if name],
+        metavar="NAMES",
+        help=f"Comma separated benchmarks to run. Available: {', '.join(BENCHMARKS)}.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per benchmark."
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Save the results as JSON, e.g. as a baseline."
+    )
+    parser.add_argument(
+        "--baseline", type=Path, help="Results of a previous run to compare with."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="Slowdown or memory growth ratio counted as a regression.",
+    )
+    args = parser.parse_args()
+    unknown = set(args.only or ()) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    sys.exit(
+        main(
+            names=args.only,
+            repeat=args.repeat,
+            output=args.output,
+            baseline=args.baseline,
+            threshold=args.threshold,
+        )
+    )
@@ -6,13 +6,49 @@ documentation automation scripts, ensuring all dynamic content is generated and
 ready for the main documentation build.
 
 The script handles two modes:
-1. Full mode: Generates all documentation including cloning npe2 for plugin docs
+1. Full mode: Generates all documentation including the npe2 plugin docs
 2. Stubs mode: Creates placeholder files for faster development builds
 
+Full mode is incremental: each generator declares its inputs (package
+versions, introspected source files, templates, release notes) and a
+fingerprint of them is stored in a manifest under ``docs/_build``. Generators
+whose fingerprint is unchanged and whose outputs exist are skipped. Use
+``--force`` to run every generator regardless.
+
+The npe2 plugin docs are rendered once per installed npe2 version and cached
+in ``NPE2_CACHE``. A cache miss is filled from a local npe2 checkout (given
+with ``--npe2-source``, next to the docs repository, or an editable install).
+npe2 is cloned from GitHub only if there is no checkout and ``--allow-network``
+is passed.
+
+``--serve`` starts a long-lived process that imports napari once and keeps
+the introspected data in memory; with ``--remote`` the event, preference and
+UI section docs are then regenerated by that process, see ``_prep_server.py``.
+It imports the scripts in this directory again when they were edited, but
+generators whose other inputs, e.g. napari, changed since the server started
+still run locally.
+
+``--watch`` polls the inputs declared by each generator and reruns only the
+generators whose inputs changed, once the changes settled.
+
+Generators are registered in ``_registry.py`` with their ordering
+requirements. ``--only`` and ``--skip`` select a subset of them, which runs in
+dependency order.
+
+With ``--jobs N`` the generators that need to run are started in separate
+processes, up to N at a time, each once the generators it requires finished.
+Qt based generators render offscreen in their worker, and a failing generator
+does not stop the others; the failures are reported once all generators
+finished.
+
 This script is typically called by the Makefile during documentation builds and
 ensures all auto-generated content (plugin docs, preference docs, event tables,
 UI architecture docs) is created before Sphinx runs.
 
+``--profile`` records the wall time, CPU time and memory use (the process peak
+RSS and how much each stage raised it) of every generator and of the main
+steps inside them, see ``_profiling.py``.
+
 Usage:
     Full documentation generation::
 
@@ -22,79 +58,509 @@ Usage:
 
         $ python docs/_scripts/prep_docs.py --stubs
 
+    Regenerate everything, ignoring the fingerprint manifest::
+
+        $ python docs/_scripts/prep_docs.py --force
+
+    Run the generators in parallel, one process per CPU::
+
+        $ python docs/_scripts/prep_docs.py --jobs auto
+
+    Keep a generator server running for live builds, and use it::
+
+        $ python docs/_scripts/prep_docs.py --serve
+        $ python docs/_scripts/prep_docs.py --remote
+
+    Only regenerate the release notes index::
+
+        $ python docs/_scripts/prep_docs.py --only release
+
+    Regenerate outputs while editing their inputs::
+
+        $ python docs/_scripts/prep_docs.py --watch
+
+    Profile the generators, including cProfile dumps::
+
+        $ python docs/_scripts/prep_docs.py --force --profile --cprofile
+
 Note:
     Make no assumptions about the working directory from which this script
     will be called. All paths are calculated relative to the script location.
 
 Attributes:
     DOCS (Path): Absolute path to the docs directory
-    NPE (Path): Path where npe2 repository will be cloned
+    NPE (Path): Default location of a local npe2 checkout
+    NPE2_CACHE (Path): Cache of rendered npe2 docs, one folder per version
+    GENERATORS (list): Module names of the registered generators, in order
+    QT_GENERATORS (set): Generators that need a QApplication
+    NPE2_STUBS (dict): Stub content of the npe2 plugin docs
 
 Functions:
-    prep_npe2(): Clones npe2 repository and generates plugin documentation
-    main(stubs): Orchestrates all documentation preparation tasks
+    prep_npe2(allow_network, source): Provides the npe2 plugin documentation
+    stub_npe2(): Writes stubs for the npe2 plugin documentation
+    outdated_generators(manifest, force): Generators whose inputs changed
+    run_parallel(names, jobs): Runs generators in separate processes
+    generate_remote(): Regenerates docs through a running prep server
+    watch(jobs): Reruns generators when their inputs change
+    main(stubs, force, jobs, ...): Orchestrates all documentation preparation tasks
 
 Attribution
 -----------
 This docstring was drafted with the assistance of Claude Code.
 The output was reviewed and edited for accuracy and clarity.
 """
+import multiprocessing
+import os
+import shutil
 import sys
+import time
+from importlib import import_module
+from multiprocessing.connection import wait
 from pathlib import Path
 from importlib.metadata import version
+from tempfile import TemporaryDirectory
 
 from packaging.version import parse
 
+import _fingerprint
+import _prep_server
+import _profiling
+import _registry
+from _fingerprint import package_path
+from _output import write_bytes
+from _profiling import stage
+
 DOCS = Path(__file__).parent.parent.absolute()
 NPE = DOCS.parent.absolute() / 'npe2'
+NPE2_CACHE = _fingerprint.CACHE_DIR / 'npe2'
+# modules of the registered generators, in execution order
+GENERATORS = [gen.module for gen in _registry.select() if gen.module]
+# generators that create a QApplication, run offscreen in worker processes
+QT_GENERATORS = {gen.module for gen in _registry.REGISTRY.values() if gen.qt}
+NPE2_STUBS = {
+    "plugins/_npe2_sample_data_guide.md": "(sample-data-contribution-guide)=\n",
+    "plugins/_npe2_readers_guide.md": "(readers-contribution-guide)=\n",
+    "plugins/_npe2_widgets_guide.md": "(widgets-contribution-guide)=\n",
+    "plugins/_npe2_menus_guide.md": "(menus-contribution-guide)=\n",
+    "plugins/_npe2_manifest.md": "# Manifest Reference\n",
+    "plugins/_npe2_writers_guide.md": "(writers-contribution-guide)=\n",
+    "plugins/_npe2_contributions.md": "# Contributions Reference\n(contributions-themes)=\n(contributions-commands)=\n(contributions-widgets)=\n(contributions-readers)=\n(contributions-writers)=\n(contributions-sample-data)=\n(layer-type-constraints)=\n",
+}
+
+
+def _npe2_checkout(source=None):
+    """Find a local npe2 checkout containing the docs renderer.
+
+    Looks at `source`, the ``npe2`` folder next to the docs repository, and
+    the repository of the installed npe2 distribution (for editable installs).
+    """
+    candidates = [Path(source)] if source else [NPE]
+    installed = package_path('npe2')
+    if installed is not None:
+        # flat and src layouts
+        candidates.extend([installed.parent, installed.parent.parent])
+    for candidate in candidates:
+        if (candidate / '_docs' / 'render.py').exists():
+            return candidate
+    if source:
+        raise FileNotFoundError(
+            f"{source} is not an npe2 checkout with _docs/render.py"
+        )
+    return None
+
 
-def prep_npe2():
+def _checkout_matches(checkout, npe2_version):
+    """Whether the npe2 `checkout` is at the commit of the installed npe2.
+
+    An editable install is its own checkout. Otherwise the commit hash in the
+    local part of a development version (``0.7.9.dev3+g1a2b3c4``), or the
+    ``v<version>`` tag of a release, must match the HEAD of the checkout.
+    """
+    from subprocess import DEVNULL, CalledProcessError, check_output
+
+    installed = package_path('npe2')
+    if installed is not None and checkout in (
+        installed.parent,
+        installed.parent.parent,
+    ):
+        return True
+    local = parse(npe2_version).local or ''
+    try:
+        if local.startswith('g'):
+            head = check_output(
+                ['git', 'rev-parse', 'HEAD'], cwd=checkout, text=True, stderr=DEVNULL
+            )
+            return head.strip().startswith(local.split('.')[0][1:])
+        tag = check_output(
+            ['git', 'describe', '--tags', '--exact-match', 'HEAD'],
+            cwd=checkout,
+            text=True,
+            stderr=DEVNULL,
+        )
+    except (OSError, CalledProcessError):
+        return False
+    return tag.strip() == f'v{npe2_version}'
+
+
+def prep_npe2(allow_network=False, source=None):
+    """Copy the npe2 plugin docs into place, rendering them if not cached.
+
+    The rendered ``plugins/_npe2_*.md`` files are cached per installed npe2
+    version in ``NPE2_CACHE``. On a cache miss they are rendered from a local
+    npe2 checkout; only if there is none and `allow_network` is set, npe2 is
+    cloned from GitHub at the tag of the installed version. Docs rendered from
+    a checkout at another version than the installed npe2, see
+    `_checkout_matches`, are used for this build but not cached.
+    """
     #   some plugin docs live in npe2 for testing purposes
-    if NPE.exists():
-        return
     from subprocess import check_call
 
     npe2_version = version("npe2")
+    cached = NPE2_CACHE / npe2_version
+    with TemporaryDirectory() as tmp:
+        docs = cached
+        if not any(cached.glob('_npe2_*.md')):
+            checkout = _npe2_checkout(source)
+            if checkout is None:
+                if not allow_network:
+                    raise RuntimeError(
+                        f"No cached plugin docs for npe2 {npe2_version} and no "
+                        "local npe2 checkout found. Pass --npe2-source with the "
+                        "path to an npe2 checkout, or --allow-network to clone it."
+                    )
+                checkout = Path(tmp) / 'npe2'
+                check_call(f"git clone https://github.com/napari/npe2 {checkout}".split())
+                if not parse(npe2_version).is_devrelease:
+                    check_call(f"git -c advice.detachedHead=false checkout tags/v{npe2_version}".split(), cwd=checkout)
+            docs = Path(tmp) / 'rendered'
+            docs.mkdir()
+            check_call([sys.executable, f"{checkout}/_docs/render.py", docs])
+            if _checkout_matches(checkout, npe2_version):
+                # move into place only once rendering succeeded
+                cached.parent.mkdir(parents=True, exist_ok=True)
+                shutil.rmtree(cached, ignore_errors=True)
+                shutil.copytree(docs, cached)
+            else:
+                print(
+                    f"npe2 checkout {checkout} is not at the installed version "
+                    f"{npe2_version}, its plugin docs are not cached"
+                )
+        for doc in docs.glob('_npe2_*.md'):
+            # unchanged docs keep their modification time, see _output.py
+            write_bytes(DOCS / 'plugins' / doc.name, doc.read_bytes())
+
+
+def stub_npe2():
+    """Write stubs for the npe2 plugin docs that do not exist yet."""
+    for doc, target in NPE2_STUBS.items():
+        file_path = DOCS / doc
+        if not file_path.exists():  # Avoid overwriting existing files
+            file_path.write_text(
+                f"{target}This is a stub. The real file is autogenerated in a full build.",
+                encoding="utf-8",
+            )
+
+
+def outdated_generators(manifest, force=False, names=GENERATORS):
+    """Fingerprint the generators `names` and return those that need to run.
+
+    Returns a dict mapping the module names of the generators whose inputs
+    changed (all of them if `force`) to their new fingerprint.
+    """
+    outdated = {}
+    for name in names:
+        with stage(f"import {name}", category="import"):
+            module = import_module(name)
+        with stage(f"fingerprint {name}", category="fingerprint"):
+            digest = _fingerprint.fingerprint(**module.fingerprint_inputs())
+        if not force and _fingerprint.is_up_to_date(
+            manifest, name, digest, module.OUTPUTS
+        ):
+            print(f"{name}: inputs unchanged, skipping")
+            continue
+        outdated[name] = digest
+    return outdated
+
+
+def _record(manifest, name, digest):
+    """Record a successful run and save the manifest right away, so that a
+    later failure keeps the results of the generators that succeeded."""
+    _fingerprint.record(manifest, name, digest, import_module(name).OUTPUTS)
+    _fingerprint.save_manifest(manifest)
+
+
+def _run_generator(name):
+    with stage(name, category="generator", cprofile=True):
+        import_module(name).main()
+
+
+def _run_in_worker(name, profile_dir=None, cprofile=False):
+    """Entry point of a generator subprocess."""
+    if name in QT_GENERATORS:
+        # no display is needed to render widgets offscreen
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if profile_dir is None:
+        _run_generator(name)
+        return
+    profiler = _profiling.enable(profile_dir, cprofile=cprofile)
+    try:
+        with stage(f"import {name}", category="import"):
+            import_module(name)
+        _run_generator(name)
+    finally:
+        profiler.save(profile_dir / f"records-{name}.json")
+
+
+def _requirements(names):
+    """Map each generator module in `names` to the modules of `names` it
+    requires, directly or through generators that are not in `names`."""
+    by_name = _registry.REGISTRY
+    by_module = {gen.module: gen for gen in by_name.values() if gen.module}
+    requirements = {}
+    for name in names:
+        found = set()
+        pending = list(by_module[name].requires) if name in by_module else []
+        seen = set()
+        while pending:
+            required = pending.pop()
+            if required in seen:
+                continue
+            seen.add(required)
+            module = by_name[required].module
+            if module in names:
+                found.add(module)
+            else:
+                pending.extend(by_name[required].requires)
+        requirements[name] = found
+    return requirements
+
+
+def run_parallel(names, jobs, requires=None):
+    """Run each generator in `names` in its own process, `jobs` at a time.
+
+    A generator is only started once the generators it requires, see
+    `_requirements`, succeeded; it is not run if one of them failed. A
+    failing generator does not stop the others. Returns a dict mapping
+    each name to whether its generator succeeded. If profiling is enabled,
+    the records of the workers are merged into the active profiler.
+    """
+    if requires is None:
+        requires = _requirements(names)
+    profiler = _profiling.active()
+    profile_args = (
+        (profiler.output_dir, profiler.cprofile) if profiler else (None, False)
+    )
+    ctx = multiprocessing.get_context("spawn")
+    pending = list(names)
+    running = {}
+    results = {}
+    while pending or running:
+        for name in list(pending):
+            if len(running) >= jobs:
+                break
+            required = [
+                other for other in requires.get(name, ()) if other in names
+            ]
+            if any(results.get(other) is False for other in required):
+                pending.remove(name)
+                results[name] = False
+                print(f"{name}: not run, a generator it requires failed")
+                continue
+            if not all(other in results for other in required):
+                continue
+            pending.remove(name)
+            proc = ctx.Process(
+                target=_run_in_worker, args=(name, *profile_args), name=name
+            )
+            proc.start()
+            running[proc.sentinel] = proc
+        if not running:
+            continue
+        for sentinel in wait(list(running)):
+            proc = running.pop(sentinel)
+            proc.join()
+            results[proc.name] = proc.exitcode == 0
+            if proc.exitcode:
+                print(f"{proc.name}: failed with exit code {proc.exitcode}")
+            if profiler is not None:
+                records = profiler.output_dir / f"records-{proc.name}.json"
+                if records.exists():
+                    profiler.merge(records)
+                    records.unlink()
+    return results
+
+
+def generate_remote(names=GENERATORS, force=False):
+    """Regenerate the outputs of the served `names` through a prep server.
+
+    Like a local run, only generators whose inputs changed since their last
+    run are regenerated (all of them with `force`), and the manifest records
+    the runs. The server collects again after edits to the scripts, but
+    generators whose other inputs, e.g. napari, changed since it started are
+    left to run locally.
+
+    Returns the names of the generators that need no local run, an empty
+    set if no server is running.
+    """
+    served = [name for name in names if name in _prep_server.SERVED_GENERATORS]
+    if not served:
+        return set()
+    manifest = _fingerprint.load_manifest()
+    outdated = outdated_generators(manifest, force=force, names=served)
+    if not outdated:
+        return set(served)
+    try:
+        results = _prep_server.request(
+            "generate", names=list(outdated), digests=outdated
+        )
+    except (OSError, ValueError) as err:
+        print(f"No prep server available ({err}), generating locally")
+        return set()
+    failed = []
+    handled = {name for name in served if name not in outdated}
+    for name, result in results.items():
+        if not result["ok"]:
+            print(f"{name}: failed on the prep server")
+            print(result["error"])
+            failed.append(name)
+        elif result["stale"]:
+            print(
+                f"{name}: not served, {result['stale']}; generating locally "
+                "(restart the prep server to serve it again)"
+            )
+        else:
+            print(
+                f"{name}: regenerated by the prep server in "
+                f"{result['seconds']:.3f} s"
+            )
+            _record(manifest, name, result["digest"])
+            handled.add(name)
+    if failed:
+        raise RuntimeError(f"Documentation generators failed: {', '.join(failed)}")
+    return handled
+
+
+def _run_outdated(force=False, jobs=1, names=GENERATORS, isolated=False):
+    """Run the generators whose inputs changed and update the manifest.
+
+    With `isolated`, generators always run in fresh processes, so that they
+    see the current state of modules that this process already imported.
+    """
+    manifest = _fingerprint.load_manifest()
+    outdated = outdated_generators(manifest, force=force, names=names)
+    if isolated or (jobs > 1 and len(outdated) > 1):
+        results = run_parallel(outdated, jobs)
+        for name, succeeded in results.items():
+            if succeeded:
+                _record(manifest, name, outdated[name])
+        failed = [name for name, ok in results.items() if not ok]
+        if failed:
+            raise RuntimeError(
+                f"Documentation generators failed: {', '.join(failed)}"
+            )
+    else:
+        for name in outdated:
+            _run_generator(name)
+            _record(manifest, name, outdated[name])
+
+
+def _watched_paths(name):
+    return import_module(name).fingerprint_inputs().get('paths', [])
+
 
-    check_call(f"rm -rf {NPE}".split())
-    check_call(f"git clone https://github.com/napari/npe2 {NPE}".split())
-    if not parse(npe2_version).is_devrelease:
-        check_call(f"git -c advice.detachedHead=false checkout tags/v{npe2_version}".split(), cwd=NPE)
-    check_call([sys.executable, f"{NPE}/_docs/render.py", DOCS / 'plugins'])
-    check_call(f"rm -rf {NPE}".split())
+def watch(jobs=1, interval=1.0, debounce=0.5, names=GENERATORS):
+    """Rerun generators whose inputs change, until interrupted.
 
+    Every `interval` seconds the inputs declared by each generator of `names` in
+    `fingerprint_inputs` are polled. Once changes settled for `debounce`
+    seconds, only the generators that depend on a changed input run again,
+    each in a fresh process so that edits to napari itself are picked up.
+    """
+    snapshots = {
+        name: _fingerprint.snapshot(_watched_paths(name)) for name in names
+    }
+    print("Watching the inputs of " + ", ".join(names))
+    try:
+        while True:
+            time.sleep(interval)
+            changed = {}
+            for name in names:
+                current = _fingerprint.snapshot(_watched_paths(name))
+                if current != snapshots[name]:
+                    changed[name] = current
+            if not changed:
+                continue
+            # wait until editors and version control finished writing
+            while True:
+                time.sleep(debounce)
+                settled = {
+                    name: _fingerprint.snapshot(_watched_paths(name))
+                    for name in changed
+                }
+                if settled == changed:
+                    break
+                changed = settled
+            snapshots.update(changed)
+            print("Inputs changed for " + ", ".join(changed))
+            # file contents changed on disk, drop the digests of this process
+            _fingerprint.path_digest.cache_clear()
+            try:
+                _run_outdated(jobs=jobs, names=list(changed), isolated=True)
+            except RuntimeError as err:
+                print(err)
+    except KeyboardInterrupt:
+        pass
 
-def main(stubs=False):
+
+def _parse_names(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def _parse_jobs(value):
+    if value == "auto":
+        return os.cpu_count() or 1
+    jobs = int(value)
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    return jobs
+
+
+def main(
+    stubs=False,
+    force=False,
+    jobs=1,
+    allow_network=False,
+    npe2_source=None,
+    profile=None,
+    cprofile=False,
+    remote=False,
+    only=None,
+    skip=None,
+):
+    selected = _registry.select(only=only, skip=skip)
+    names = [gen.module for gen in selected if gen.module]
+    with_npe2 = any(gen.name == "npe2" for gen in selected)
     if stubs:
-        #prep_npe2()
-        # Generate stub files for plugin docs
-        plugin_docs = {
-            "plugins/_npe2_sample_data_guide.md": "(sample-data-contribution-guide)=\n",
-            "plugins/_npe2_readers_guide.md": "(readers-contribution-guide)=\n",
-            "plugins/_npe2_widgets_guide.md": "(widgets-contribution-guide)=\n",
-            "plugins/_npe2_menus_guide.md": "(menus-contribution-guide)=\n",
-            "plugins/_npe2_manifest.md": "# Manifest Reference\n",
-            "plugins/_npe2_writers_guide.md": "(writers-contribution-guide)=\n",
-            "plugins/_npe2_contributions.md": "# Contributions Reference\n(contributions-themes)=\n(contributions-commands)=\n(contributions-widgets)=\n(contributions-readers)=\n(contributions-writers)=\n(contributions-sample-data)=\n(layer-type-constraints)=\n",
-        }
-        for doc, target in plugin_docs.items():
-            file_path = DOCS / doc
-            if not file_path.exists():  # Avoid overwriting existing files
-                file_path.write_text(
-                    f"{target}This is a stub. The real file is autogenerated in a full build.",
-                    encoding="utf-8",
-                )
+        if with_npe2:
+            # Generate stub files for plugin docs
+            stub_npe2()
         # Generate stub files from the other scripts
-        __import__('update_preference_docs').main(stubs=True)
-        __import__('update_event_docs').main(stubs=True)
-        __import__('update_ui_sections_docs').main(stubs=True)
-        __import__('update_release_docs').main(stubs=False)
+        for gen in selected:
+            if gen.module:
+                import_module(gen.module).main(stubs=not gen.stub_runs_full)
     else:
-        prep_npe2()
-        __import__('update_preference_docs').main()
-        __import__('update_event_docs').main()
-        __import__('update_ui_sections_docs').main()
-        __import__('update_release_docs').main()
+        profiler = _profiling.enable(profile, cprofile) if profile else None
+        try:
+            if with_npe2:
+                with stage("prep_npe2"):
+                    prep_npe2(allow_network=allow_network, source=npe2_source)
+            if remote:
+                served = generate_remote(names, force=force)
+                names = [name for name in names if name not in served]
+            _run_outdated(force=force, jobs=jobs, names=names)
+        finally:
+            if profiler is not None:
+                profiler.write_reports()
 
 
 if __name__ == "__main__":
@@ -106,6 +572,118 @@ if __name__ == "__main__":
         action="store_true",
         help="Generate stubs versions of the documentation files.",
     )
+    parser.add_argument(
+        "--only",
+        type=_parse_names,
+        metavar="NAMES",
+        help=(
+            "Comma separated generators to run, with the generators they "
+            f"require. Available: {', '.join(_registry.REGISTRY)}."
+        ),
+    )
+    parser.add_argument(
+        "--skip",
+        type=_parse_names,
+        metavar="NAMES",
+        help="Comma separated generators not to run.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run all generators, even if their inputs did not change.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_parse_jobs,
+        default=1,
+        help=(
+            "Number of generators to run in parallel processes, "
+            "or 'auto' to use one per CPU (default: 1, in process)."
+        ),
+    )
+    parser.add_argument(
+        "--allow-network",
+        action="store_true",
+        help="Clone npe2 from GitHub if its plugin docs are not cached.",
+    )
+    parser.add_argument(
+        "--npe2-source",
+        metavar="PATH",
+        help="Local npe2 checkout used to render the plugin docs on a cache miss.",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=DOCS / "_build" / "prep_profile",
+        type=Path,
+        metavar="DIR",
+        help=(
+            "Record wall time, CPU time and peak RSS growth of every stage "
+            "and write summary.json and trace.json to DIR "
+            "(default: docs/_build/prep_profile)."
+        ),
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="With --profile, also write cProfile stats of each generator.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help=(
+            "Start a long-lived process that keeps the introspected napari "
+            "data in memory and regenerates the docs on request."
+        ),
+    )
+    parser.add_argument(
+        "--remote",
+        action="store_true",
+        help=(
+            "Let a running --serve process regenerate the docs it serves. "
+            "Generators whose inputs outside of docs/_scripts, e.g. napari, "
+            "changed since the server started run locally instead; restart "
+            "the server to serve them again."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running and regenerate the outputs of a generator whenever "
+            "one of its inputs changes."
+        ),
+    )
     args = parser.parse_args()
+    try:
+        _registry.select(only=args.only, skip=args.skip)
+    except ValueError as err:
+        parser.error(str(err))
+
+    if args.serve:
+        _prep_server.PrepServer().serve_forever()
+        sys.exit()
+    if args.watch:
+        watch(
+            jobs=args.jobs,
+            names=[
+                gen.module
+                for gen in _registry.select(only=args.only, skip=args.skip)
+                if gen.module
+            ],
+        )
+        sys.exit()
 
-    main(stubs=args.stubs)
+    main(
+        stubs=args.stubs,
+        force=args.force,
+        jobs=args.jobs,
+        allow_network=args.allow_network,
+        npe2_source=args.npe2_source,
+        profile=args.profile,
+        cprofile=args.cprofile,
+        remote=args.remote,
+        only=args.only,
+        skip=args.skip,
+    )
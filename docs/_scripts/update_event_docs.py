@@ -5,14 +5,23 @@ documentation of all events available in the viewer, layer list, and individual
 layers. It creates markdown tables that document event names, descriptions,
 access patterns, and types.
 
-The script uses AST parsing to discover EmitterGroup definitions in the codebase
-and introspection to find events in EventedModel subclasses. It generates three
+The script queries a static AST index of the napari sources (see
+``_class_index.py``) for EmitterGroup definitions and EventedModel subclasses,
+and uses introspection to find the events of these classes. It generates three
 main documentation files that are included in the napari guides.
 
 Generated Documentation:
     - _viewer_events.md: Events available on the viewer model
     - _layerlist_events.md: Events for the layer list and selection
     - _layer_events.md: Events specific to each layer type
+    - _build/event_catalog/napari-<version>.json: All events, machine readable
+    - _event_costs.md: Section with the cost of emitting each event,
+      measured only with ``--event-costs`` or the ``NAPARI_DOCS_EVENT_COSTS``
+      environment variable, otherwise empty
+
+Tables longer than ``NAPARI_DOCS_MAX_TABLE_ROWS`` rows (150 by default) are
+split in one include file per layer class, or per object holding the events,
+e.g. ``_layer_events_image.md``, and the main file includes them.
 
 The documentation includes:
     - Event name and description
@@ -29,16 +38,30 @@ Usage:
 
         $ python docs/_scripts/update_event_docs.py --stubs
 
+    Compare the event catalogs of two napari versions::
+
+        $ python docs/_scripts/update_event_docs.py --diff napari-0.5.0.json napari-0.5.1.json
+
 Classes:
     Ev: Dataclass representing an event with its metadata
+    EventCatalog: All documented events, from which the tables are rendered
 
 Functions:
+    build_catalog: Find all documented events in a single pass
     iter_evented_model_events: Find events in EventedModel subclasses
     iter_evented_container_events: Find events in containers like LayerList
     iter_layer_events: Extract layer-specific events
+    base_event_names: Find the events of the base Layer class
+    static_layer_event_names: Find the events of a layer class in its sources
+    iter_subclasses: Find napari classes deriving from a class, statically
     walk_modules: Recursively walk through napari modules
     class_doc_attrs: Extract attributes from class docstrings
-    merge_image_and_label_rows: Consolidate common events across layer types
+    group_layer_rows: Consolidate events shared by several layer types
+    collect: Introspect napari and build the event catalog
+    measure_event_costs: Time the emission of every event
+    load_catalog: Read an event catalog written by `render`
+    diff_catalogs: Find added, removed and changed events between catalogs
+    render: Write the event tables from the event catalog
     main: Orchestrate event documentation generation
 
 Attribution
@@ -48,23 +71,87 @@ The output was reviewed and edited for accuracy and clarity.
 """
 
 import ast
+import hashlib
 import inspect
-from dataclasses import dataclass
+import json
+import os
+import pydoc
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import import_module
 from pathlib import Path
 from types import ModuleType
-from typing import Dict, Iterator, List, Optional, Type
-
-import numpy as np
-from _table_maker import table_repr
-from numpydoc.docscrape import ClassDoc, Parameter
-
-import napari
-from napari import layers
-from napari.components.layerlist import LayerList
-from napari.components.viewer_model import ViewerModel
-from napari.utils.events import EventedModel
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from _disk_cache import DiskCache
+from _fingerprint import CACHE_DIR, package_path, package_version
+from _output import open_text, write_text
+from _profiling import stage, timed
+
+# napari, numpy (also used by _table_maker) and numpydoc are imported where
+# they are needed, so that generating the stubs does not pay for importing
+# them.
+if TYPE_CHECKING:
+    from _table_maker import Table
 
 DOCS = Path(__file__).parent.parent
+TABLE_OUTPUTS = [
+    DOCS / 'guides' / '_viewer_events.md',
+    DOCS / 'guides' / '_layerlist_events.md',
+    DOCS / 'guides' / '_layer_events.md',
+]
+CATALOG_PATH = (
+    DOCS
+    / '_build'
+    / 'event_catalog'
+    / f"napari-{package_version('napari') or 'unknown'}.json"
+)
+# tables with more rows are split in one include file per group, 0 to never
+# split them, see `write_event_table`
+MAX_TABLE_ROWS = int(os.environ.get('NAPARI_DOCS_MAX_TABLE_ROWS') or 150)
+# cost of emitting each event, measured on request, see `measure_event_costs`
+EVENT_COSTS = bool(os.environ.get('NAPARI_DOCS_EVENT_COSTS'))
+COSTS_PATH = DOCS / 'guides' / '_event_costs.md'
+COSTS_INTRO = (
+    "## Emission costs\n\n"
+    "The median time to emit each event, in microseconds, with the number of "
+    "no-op callbacks given in the column headers connected, and the time "
+    "until the first callback runs. The events are emitted on models and "
+    "small layers without a viewer window, and the timings depend on the "
+    "machine that built this documentation.\n\n"
+)
+OUTPUTS = [*TABLE_OUTPUTS, COSTS_PATH, CATALOG_PATH]
+
+
+def fingerprint_inputs():
+    """Inputs that determine the generated event tables."""
+    return {
+        'packages': ['napari', 'numpydoc'],
+        'paths': [
+            package_path('napari'),
+            Path(__file__),
+            Path(__file__).parent / '_table_maker.py',
+            Path(__file__).parent / '_class_index.py',
+        ],
+        'extra': [
+            f'event_costs={EVENT_COSTS}',
+            f'max_table_rows={MAX_TABLE_ROWS}',
+        ],
+    }
 
 
 @dataclass
@@ -76,6 +163,11 @@ class Ev:
 
     def access_at(self):
         """Where this event can be accessed (in code)"""
+        import napari
+        from napari import layers
+        from napari.components.layerlist import LayerList
+        from napari.components.viewer_model import ViewerModel
+
         if issubclass(self.model, layers.Layer):
             return f'layer.events.{self.name}'
 
@@ -142,197 +234,687 @@ def iter_classes(module: ModuleType) -> Iterator[Type]:
             yield attr
 
 
-def class_doc_attrs(kls: Type) -> Dict[str, Parameter]:
-    docs = {p.name: " ".join(p.desc) for p in ClassDoc(kls).get('Attributes')}
-    docs.update(
-        {p.name: " ".join(p.desc) for p in ClassDoc(kls).get('Parameters')}
-    )
+# the Qt and vispy front ends define no documented models, and importing
+# them would import Qt
+QT_PACKAGES = {'_qt', '_vispy'}
+
+
+def iter_subclasses(
+    base: Union[Type, Tuple[Type, ...]], module: Optional[ModuleType] = None
+) -> Iterator[Type]:
+    """iter the classes deriving from `base` in `module` (napari by default).
+
+    `base` can be a tuple of classes, as for `issubclass`.
+
+    Candidates are found in the static class index of the napari sources and
+    only their modules are imported. Falls back to walking all modules if the
+    sources cannot be found.
+    """
+    from _class_index import load_index
+
+    prefix = module.__name__ if module else 'napari'
+    index = load_index('napari')
+    if index is None:
+        import napari
+
+        for mod in walk_modules(module or napari):
+            for kls in iter_classes(mod):
+                if issubclass(kls, base):
+                    yield kls
+        return
+
+    bases = base if isinstance(base, tuple) else (base,)
+    for modname, name in index.subclasses(
+        *(f'{kls.__module__}.{kls.__qualname__}' for kls in bases)
+    ):
+        if modname != prefix and not modname.startswith(prefix + '.'):
+            continue
+        if QT_PACKAGES.intersection(modname.split('.')):
+            continue
+        try:
+            kls = getattr(import_module(modname), name, None)
+        except ImportError:
+            continue
+        if (
+            inspect.isclass(kls)
+            and kls.__module__ == modname
+            and issubclass(kls, base)
+        ):
+            yield kls
+
+
+@lru_cache(maxsize=None)
+def _class_doc_cache() -> DiskCache:
+    """Parsed class docstrings of previous runs."""
+    return DiskCache(CACHE_DIR / 'class_docs.json')
+
+
+def _class_doc_digest(kls: Type) -> str:
+    """Hash of everything numpydoc reads to document `kls` attributes.
+
+    Without an Attributes section numpydoc lists the properties of the
+    class, so their docstrings are part of the input.
+    """
+    digest = hashlib.sha256(package_version('numpydoc').encode())
+    digest.update(b'\0' + (pydoc.getdoc(kls) or '').encode())
+    for name, member in inspect.getmembers(kls):
+        if name.startswith('_') or not (
+            member is None
+            or isinstance(member, property)
+            or inspect.isdatadescriptor(member)
+        ):
+            continue
+        digest.update(f'\0{name}\0{pydoc.getdoc(member)}'.encode())
+    return digest.hexdigest()
+
+
+@timed('class_doc_attrs')
+@lru_cache(maxsize=None)
+def class_doc_attrs(kls: Type) -> Dict[str, str]:
+    """Descriptions of the attributes and parameters documented by `kls`.
+
+    Docstrings are parsed once per process, and results are kept across runs
+    in a cache keyed by the qualified name and a hash of the docstrings.
+    """
+    key = f'{kls.__module__}.{kls.__qualname__}'
+    digest = _class_doc_digest(kls)
+    docs = _class_doc_cache().get(key, digest)
+    if docs is None:
+        from numpydoc.docscrape import ClassDoc
+
+        class_doc = ClassDoc(kls)
+        docs = {p.name: " ".join(p.desc) for p in class_doc.get('Attributes')}
+        docs.update(
+            {p.name: " ".join(p.desc) for p in class_doc.get('Parameters')}
+        )
+        _class_doc_cache().set(key, digest, docs)
     return docs
 
 
-def iter_evented_model_events(module: ModuleType = napari) -> Iterator[Ev]:
-    for mod in walk_modules(module):
-        for kls in iter_classes(mod):
-            if not issubclass(kls, EventedModel):
-                continue
-            docs = class_doc_attrs(kls)
-            for name, field_ in kls.__fields__.items():
-                finfo = field_.field_info
-                if finfo.allow_mutation:
-                    descr = (
-                        f"{finfo.title.lower()}"
-                        if finfo.title
-                        else docs.get(name)
-                    )
-                    yield Ev(name, kls, descr, field_.type_)
+def iter_evented_model_events(
+    module: Optional[ModuleType] = None,
+) -> Iterator[Ev]:
+    from napari.utils.events import EventedModel
+
+    for kls in iter_subclasses(EventedModel, module):
+        yield from model_events(kls)
+
+
+def model_events(kls: Type) -> Iterator[Ev]:
+    """iter the events of the mutable fields of EventedModel `kls`."""
+    docs = class_doc_attrs(kls)
+    for name, field_ in kls.__fields__.items():
+        finfo = field_.field_info
+        if finfo.allow_mutation:
+            descr = f"{finfo.title.lower()}" if finfo.title else docs.get(name)
+            yield Ev(name, kls, descr, field_.type_)
 
 
 def iter_evented_container_events(
-    module: ModuleType = napari, container_class=LayerList
+    module: Optional[ModuleType] = None, container_class=None
 ) -> Iterator[Ev]:
-    for mod in walk_modules(module):
-        for kls in iter_classes(mod):
-            if not issubclass(kls, container_class):
+    from napari.components.layerlist import LayerList
+
+    container_class = container_class or LayerList
+    for kls in iter_subclasses(container_class, module):
+        yield from container_events(kls)
+
+
+def container_events(kls: Type) -> Iterator[Ev]:
+    """iter the events of container `kls` and of its selection."""
+    docs = class_doc_attrs(kls)
+    kls_instance = kls()
+    for name, emitter in kls_instance.events._emitters.items():
+        descr = docs.get(name)
+        yield Ev(name, kls, descr, type_=None)
+    if hasattr(kls_instance, 'selection'):
+        selection = kls_instance.selection
+        for name, emitter in selection.events._emitters.items():
+            if name.startswith('_'):
+                # skip private emitters
                 continue
-            docs = class_doc_attrs(kls)
-            kls_instance = kls()
-            for name, emitter in kls_instance.events._emitters.items():
-                descr = docs.get(name)
-                yield Ev(name, kls, descr, type_=None)
-            if hasattr(kls_instance, 'selection'):
-                selection = kls_instance.selection
-                for name, emitter in selection.events._emitters.items():
-                    if name.startswith('_'):
-                        # skip private emitters
-                        continue
-                    name = 'selection.' + name
-                    descr = docs.get(name)
-                    yield Ev(name, kls, descr, type_=None)
-
-
-class BaseEmitterVisitor(ast.NodeVisitor):
-    def __init__(self) -> None:
-        super().__init__()
-        self._emitters: List[str] = []
-
-    def visit_Call(self, node: ast.Call):
-        if getattr(node.func, 'id', None) == 'EmitterGroup':
-            self._emitters.extend([name.arg for name in node.keywords])  # type: ignore
+            name = 'selection.' + name
+            descr = docs.get(name)
+            yield Ev(name, kls, descr, type_=None)
+
+
+@dataclass
+class EventCatalog:
+    """The documented events, by table.
+
+    Built in a single pass by `build_catalog`, all tables are rendered
+    from it.
+    """
+
+    # fields of the machine readable catalog, see `records`
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        'table',
+        'class',
+        'name',
+        'access',
+        'description',
+        'type',
+    )
+
+    viewer: List[Ev] = field(default_factory=list)
+    layerlist: List[Ev] = field(default_factory=list)
+    layer: List[Ev] = field(default_factory=list)
+    # event costs table, if measured, see `measure_event_costs`
+    costs: Optional['Table'] = None
+
+    def tables(self) -> Dict[str, 'Table']:
+        """The event tables, and the event costs table if measured."""
+        from _table_maker import Table
+
+        rows = self.rows()
+        header = ['Event', 'Description', 'Event.value type']
+        tables = {
+            'viewer': Table.from_rows(rows['viewer'], header),
+            'layerlist': Table.from_rows(rows['layerlist'], header),
+            'layer': Table.from_rows(rows['layer'], ['Class', *header]),
+        }
+        if self.costs is not None:
+            tables['costs'] = self.costs
+        return tables
+
+    def records(self) -> List[List[str]]:
+        """One row of `COLUMNS` values for every event."""
+        return [
+            [
+                table,
+                ev.model.__name__,
+                ev.name,
+                ev.access_at(),
+                ev.description or '',
+                ev.type_name(),
+            ]
+            for table in ('viewer', 'layerlist', 'layer')
+            for ev in getattr(self, table)
+        ]
+
+    def rows(self) -> Dict[str, List[List[str]]]:
+        """Rows of the three event tables."""
+        return {
+            'viewer': [ev.ev_model_row()[2:] for ev in self.viewer],
+            'layerlist': [ev.layer_row()[2:] for ev in self.layerlist],
+            'layer': group_layer_rows(
+                [[ev.layer_row()[0]] + ev.layer_row()[2:] for ev in self.layer]
+            ),
+        }
+
+
+def build_catalog(
+    module: Optional[ModuleType] = None, container_class=None
+) -> EventCatalog:
+    """Find all viewer, container, selection and layer events in one pass.
+
+    The EventedModel and container subclasses are found with a single
+    lookup of the class index, and each container is instantiated once.
+    Only events that can be accessed from the viewer or a layer are kept.
+    """
+    from napari.components.layerlist import LayerList
+    from napari.utils.events import EventedModel
+
+    container_class = container_class or LayerList
+    catalog = EventCatalog()
+    for kls in iter_subclasses((EventedModel, container_class), module):
+        if issubclass(kls, EventedModel):
+            catalog.viewer.extend(
+                ev for ev in model_events(kls) if ev.access_at()
+            )
+        if issubclass(kls, container_class):
+            catalog.layerlist.extend(
+                ev for ev in container_events(kls) if ev.access_at()
+            )
+    with stage('iter_layer_events'):
+        catalog.layer.extend(iter_layer_events())
+    return catalog
 
 
 def base_event_names() -> List[str]:
-    from napari.layers.base import base
+    """Names of the emitters created in the module of the base Layer."""
+    from _class_index import load_index
 
-    root = ast.parse(Path(base.__file__).read_text())
-    visitor = BaseEmitterVisitor()
-    visitor.visit(root)
-    return visitor._emitters
+    index = load_index('napari')
+    if index is None:
+        from _class_index import EmitterVisitor
+        from napari.layers.base import base
 
+        visitor = EmitterVisitor()
+        visitor.visit(ast.parse(Path(base.__file__).read_text()))
+        calls = visitor.emitters
+    else:
+        calls = index.emitters('napari.layers.base.base')
+    return [
+        name
+        for call in calls
+        if call['call'] == 'EmitterGroup'
+        for name in call['names']
+    ]
+
+
+# keywords of EmitterGroup and EmitterGroup.add that are not emitters
+RESERVED_KEYWORDS = ('source', 'auto_connect')
+
+
+def static_layer_event_names(kls: Type) -> Optional[List[str]]:
+    """Emitter names of layer class `kls`, found without instantiating it.
+
+    The emitter calls recorded in the class index for the napari classes in
+    the MRO of `kls` are used, base classes first. Returns None if an emitter
+    name cannot be determined statically.
+    """
+    from _class_index import load_index
+
+    index = load_index('napari')
+    if index is None:
+        return None
+    names: List[str] = []
+    for klass in reversed(kls.__mro__):
+        if not klass.__module__.startswith('napari.'):
+            continue
+        for call in index.emitters(klass.__module__, klass.__qualname__):
+            if call['undecided']:
+                return None
+            names.extend(
+                name
+                for name in call['names']
+                if name not in RESERVED_KEYWORDS and name not in names
+            )
+    return names
+
+
+def example_layer(kls: Type):
+    """Small instance of layer class `kls`, from fixed data."""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    data = {
+        'Image': lambda: rng.random((2, 2)),
+        'Labels': lambda: rng.integers(20, size=(10, 15)),
+        'Points': lambda: 10 * rng.random((10, 2)),
+        'Vectors': lambda: 20 * rng.random((10, 2, 2)),
+        'Shapes': lambda: 20 * rng.random((10, 4, 2)),
+        'Surface': lambda: (
+            20 * rng.random((10, 3)),
+            rng.integers(10, size=(6, 3)),
+            rng.random(10),
+        ),
+        'Tracks': lambda: np.column_stack(
+            (np.ones(20), np.arange(20), 20 * rng.random((20, 2)))
+        ),
+    }
+    return kls(data[kls.__name__]())
+
+
+def iter_layer_events(static: bool = True) -> Iterator[Ev]:
+    """iter the events of the base Layer, then those of each layer type.
+
+    With `static`, the events of a layer type are read from its sources
+    (see `static_layer_event_names`), and a layer is only instantiated if
+    that analysis cannot decide.
+    """
+    from napari import layers
 
-def iter_layer_events() -> Iterator[Ev]:
     basenames = base_event_names()
     docs = class_doc_attrs(layers.Layer)
     for name in basenames:
         yield Ev(name, layers.Layer, description=docs.get(name))
 
-    EXAMPLE_LAYERS: List[layers.Layer] = [
-        layers.Image(np.random.random((2, 2))),
-        layers.Labels(np.random.randint(20, size=(10, 15))),
-        layers.Points(10 * np.random.random((10, 2))),
-        layers.Vectors(20 * np.random.random((10, 2, 2))),
-        layers.Shapes(20 * np.random.random((10, 4, 2))),
-        layers.Surface(
-            (
-                20 * np.random.random((10, 3)),
-                np.random.randint(10, size=(6, 3)),
-                np.random.random(10),
-            )
-        ),
-        layers.Tracks(
-            np.column_stack(
-                (np.ones(20), np.arange(20), 20 * np.random.random((20, 2)))
-            )
-        ),
+    LAYER_CLASSES: List[Type[layers.Layer]] = [
+        layers.Image,
+        layers.Labels,
+        layers.Points,
+        layers.Vectors,
+        layers.Shapes,
+        layers.Surface,
+        layers.Tracks,
     ]
 
-    for lay in EXAMPLE_LAYERS:
-        docs = class_doc_attrs(type(lay))
-        for name in [i for i in lay.events.emitters if i not in basenames]:
-            yield Ev(name, lay.__class__, description=docs.get(name))
-
-
-def merge_image_and_label_rows(rows: List[List[str]]):
-    """Merge events common to _ImageBase or IntensityVisualizationMixin."""
-    # find events that are common across both Image, Labels and Surface layers.
-    image_events = {r[1] for r in rows if r[0] == '`Image`'}
-    labels_events = {r[1] for r in rows if r[0] == '`Labels`'}
-    surface_events = {r[1] for r in rows if r[0] == '`Surface`'}
-    common_events = image_events & labels_events & surface_events
-    # common only to Image and Labels
-    imagebase_events = (image_events & labels_events) - common_events
-
-    # drop duplicate Labels and/or Surface entries
-    rows = [
-        r
-        for r in rows
-        if not (r[0] in ['`Labels`', '`Surface`'] and r[1] in common_events)
-    ]
-    rows = [
-        r
-        for r in rows
-        if not (r[0] in ['`Labels`', '`Surface`'] and r[1] in imagebase_events)
+    for kls in LAYER_CLASSES:
+        names = static_layer_event_names(kls) if static else None
+        if names is None:
+            names = list(example_layer(kls).events.emitters)
+        docs = class_doc_attrs(kls)
+        for name in [i for i in names if i not in basenames]:
+            yield Ev(name, kls, description=docs.get(name))
+
+
+def group_layer_rows(rows: List[List[str]]) -> List[List[str]]:
+    """Merge the rows of events shared by several layer classes.
+
+    Rows are indexed by event and description in a single pass; rows with
+    the same event and the same description are merged into one row, at the
+    position of the first of them, listing all the classes that have it.
+    An event whose description differs between classes, e.g. ``shading`` of
+    Points and Surface, keeps a row for each description.
+    """
+    # (event, description) -> (classes, as dict keys to keep their order, row)
+    groups: Dict[Tuple[str, str], Tuple[Dict[str, None], List[str]]] = {}
+    for row in rows:
+        group = groups.get((row[1], row[2]))
+        if group is None:
+            groups[row[1], row[2]] = ({row[0]: None}, row)
+        else:
+            group[0][row[0]] = None
+    return [
+        [', '.join(classes), *row[1:]] for classes, row in groups.values()
     ]
 
-    # modify the class name of the Image entries to mention Labels, Surface
-    rows = [
-        ['`Image`, `Labels`'] + r[1:]
-        if r[0] == '`Image`' and r[1] in imagebase_events
-        else r
-        for r in rows
-    ]
-    rows = [
-        ['`Image`, `Labels`, `Surface`'] + r[1:]
-        if r[0] == '`Image`' and r[1] in common_events
-        else r
-        for r in rows
+
+def time_emission(
+    emitter, value=None, listeners=0, number=100, repeat=5
+) -> float:
+    """Median seconds to emit `emitter` with `listeners` no-op callbacks."""
+    # distinct functions, the same callback is only connected once
+    callbacks = [lambda event: None for _ in range(listeners)]
+    for callback in callbacks:
+        emitter.connect(callback)
+    try:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                emitter(value=value)
+            times.append((time.perf_counter() - start) / number)
+    finally:
+        for callback in callbacks:
+            emitter.disconnect(callback)
+    return statistics.median(times)
+
+
+def first_listener_latency(emitter, value=None, repeat=100) -> float:
+    """Median seconds from emitting `emitter` until its first listener runs."""
+    called: List[float] = []
+
+    def callback(event):
+        called.append(time.perf_counter())
+
+    emitter.connect(callback, position='first')
+    try:
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            emitter(value=value)
+            latencies.append(called[-1] - start)
+    finally:
+        emitter.disconnect(callback)
+    return statistics.median(latencies)
+
+
+def measure_event_costs(
+    catalog: EventCatalog, listeners: int = 10
+) -> 'Table':
+    """Time the emission of every event of `catalog`.
+
+    Each event is emitted on a small instance of its class, with its current
+    value, with 0, 1 and `listeners` no-op callbacks connected. Base layer
+    events are emitted on an Image layer, and viewer events on a
+    `ViewerModel`, so no window is created and Qt listeners do not count.
+    Events of classes from Qt packages, of classes that cannot be
+    instantiated, or whose emission fails, are reported as n/a. The
+    instances are closed afterwards, if they can be.
+
+    Returns
+    -------
+    Table
+        Class, event, the median emission cost in microseconds for each
+        number of callbacks and the latency of the first callback.
+    """
+    from _table_maker import Table
+    from napari import layers
+    from napari.components.viewer_model import ViewerModel
+
+    instances: Dict[Type, object] = {}
+
+    def instance_of(kls):
+        if issubclass(kls, ViewerModel):
+            # napari.Viewer would open a window, its events are the model's
+            kls = ViewerModel
+        if kls not in instances:
+            try:
+                if QT_PACKAGES.intersection(kls.__module__.split('.')):
+                    instances[kls] = None
+                elif kls is layers.Layer:
+                    instances[kls] = example_layer(layers.Image)
+                elif issubclass(kls, layers.Layer):
+                    instances[kls] = example_layer(kls)
+                else:
+                    instances[kls] = kls()
+            except Exception:  # noqa: BLE001
+                instances[kls] = None
+        return instances[kls]
+
+    rows = []
+    try:
+        for ev in [*catalog.viewer, *catalog.layerlist, *catalog.layer]:
+            row = [f'`{ev.model.__name__}`', f'`{ev.access_at()}`']
+            source = instance_of(ev.model)
+            name = ev.name
+            if source is not None and name.startswith('selection.'):
+                source, name = getattr(source, 'selection', None), name[10:]
+            try:
+                emitter = getattr(source.events, name)
+                value = getattr(source, name, None)
+                costs = [
+                    time_emission(emitter, value, count)
+                    for count in (0, 1, listeners)
+                ]
+                costs.append(first_listener_latency(emitter, value))
+            except Exception:  # noqa: BLE001
+                row.extend(['n/a'] * 4)
+            else:
+                row.extend(f'{cost * 1e6:.2f}' for cost in costs)
+            rows.append(row)
+    finally:
+        for instance in instances.values():
+            close = getattr(instance, 'close', None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:  # noqa: BLE001
+                    pass
+        instances.clear()
+    header = [
+        'Class',
+        'Event',
+        'No listener (µs)',
+        '1 listener (µs)',
+        f'{listeners} listeners (µs)',
+        'First listener called after (µs)',
     ]
-    return rows
+    return Table.from_rows(rows, header)
+
+
+def collect(event_costs: bool = EVENT_COSTS) -> EventCatalog:
+    """Introspect napari and return the catalog of its events.
+
+    This is the expensive part of the generation; the result can be kept
+    in memory and passed to `render` again, see ``_prep_server.py``.
+    With `event_costs`, the emission cost of each event is measured too.
+    """
+    with stage('build_catalog'):
+        catalog = build_catalog()
+    _class_doc_cache().save()
+    if event_costs:
+        with stage('measure_event_costs'):
+            catalog.costs = measure_event_costs(catalog)
+    return catalog
+
+
+def render(catalog: EventCatalog) -> None:
+    """Write the event tables from the catalog returned by `collect`."""
+    tables = catalog.tables()
+    for name, path in zip(('viewer', 'layerlist', 'layer'), TABLE_OUTPUTS):
+        table = tables[name]
+        if name == 'layer':
+            # a page per class, events shared by classes are on each page
+            groups = [
+                classes.split(', ') for classes in table.column('Class')
+            ]
+        else:
+            # the object holding the events, e.g. `viewer.camera`
+            groups = [
+                '`' + event.strip('`').partition('.events.')[0] + '`'
+                for event in table.column('Event')
+            ]
+        write_event_table(table, path, groups)
+
+    write_catalog(catalog)
+
+    # always written, guides/events_reference.md includes it; the section
+    # is left out of builds that did not measure the costs
+    if 'costs' in tables:
+        with open_text(COSTS_PATH) as stream:
+            stream.write(COSTS_INTRO)
+            tables['costs'].write(stream, padding=2)
+    else:
+        write_text(COSTS_PATH, '')
+
+
+def write_event_table(
+    table: 'Table', path: Path, by, max_rows: int = MAX_TABLE_ROWS
+) -> List[Path]:
+    """Write `table` to `path`, split in include files if it is too long.
+
+    A table of more than `max_rows` rows is split by `by`, see
+    `Table.pages`, and each page is written to ``<stem>_<group>.md`` next to
+    `path`. A key of `by` may also be a list of keys, the row is then on the
+    page of each of them. `path` then holds a section per page, with a MyST
+    target such as ``(layer-events-image)=``, a heading and an include of
+    the page. Pages of a previous split that are no longer needed are
+    removed.
+
+    Returns the files written.
+    """
+    stale = set(path.parent.glob(f'{path.stem}_*.md'))
+    written = [path]
+    if max_rows and len(table) > max_rows:
+        if not isinstance(by, str):
+            indices, keys = [], []
+            for i, key in enumerate(by):
+                for one in key if isinstance(key, list) else [key]:
+                    indices.append(i)
+                    keys.append(one)
+            table, by = table.take(indices), keys
+        prefix = path.stem.strip('_').replace('_', '-')
+        slugs = set()
+        with open_text(path) as index:
+            for title, page in table.pages(max_rows, by):
+                base = (
+                    re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+                    or 'group'
+                )
+                slug, n = base, 2
+                while slug in slugs:  # titles differing only in punctuation
+                    slug, n = f'{base}-{n}', n + 1
+                slugs.add(slug)
+                page_path = path.with_name(f'{path.stem}_{slug}.md')
+                with open_text(page_path) as stream:
+                    page.write(stream, padding=2)
+                written.append(page_path)
+                index.write(
+                    f'({prefix}-{slug})=\n### {title}\n\n'
+                    f'```{{include}} {page_path.name}\n```\n\n'
+                )
+    else:
+        with open_text(path) as stream:
+            table.write(stream, padding=2)
+    for page_path in stale.difference(written):
+        page_path.unlink()
+    return written
+
+
+def write_catalog(catalog: EventCatalog, path: Path = CATALOG_PATH) -> None:
+    """Write `catalog` as JSON, with the column names stored once."""
+    write_text(
+        path,
+        json.dumps(
+            {
+                'napari': package_version('napari'),
+                'columns': list(EventCatalog.COLUMNS),
+                'events': catalog.records(),
+            },
+            separators=(',', ':'),
+        ),
+    )
 
 
-def main(stubs=False):
+def load_catalog(path: Path) -> Dict:
+    """Read a catalog written by `write_catalog`.
+
+    Returns a dict with the napari version under ``napari`` and a list of
+    dicts, one per event, under ``events``.
+    """
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    return {
+        'napari': data['napari'],
+        'events': [dict(zip(data['columns'], row)) for row in data['events']],
+    }
+
+
+def diff_catalogs(old: Dict, new: Dict) -> Dict[str, List]:
+    """Compare two catalogs returned by `load_catalog`.
+
+    Events are identified by their table, class and access path.
+
+    Returns
+    -------
+    dict
+        ``added`` and ``removed`` list the events only in `new` or `old`,
+        ``changed`` lists ``(old, new)`` pairs whose description or type
+        differ.
+    """
+
+    def by_key(catalog):
+        return {
+            (ev['table'], ev['class'], ev['access']): ev
+            for ev in catalog['events']
+        }
+
+    old_events, new_events = by_key(old), by_key(new)
+    return {
+        'added': [ev for key, ev in new_events.items() if key not in old_events],
+        'removed': [
+            ev for key, ev in old_events.items() if key not in new_events
+        ],
+        'changed': [
+            (old_events[key], ev)
+            for key, ev in new_events.items()
+            if key in old_events and old_events[key] != ev
+        ],
+    }
+
+
+def format_diff(diff: Dict[str, List]) -> str:
+    """Human readable report of the result of `diff_catalogs`."""
+    lines = []
+    for ev in diff['added']:
+        lines.append(f"+ {ev['access']} ({ev['class']})")
+    for ev in diff['removed']:
+        lines.append(f"- {ev['access']} ({ev['class']})")
+    for old, new in diff['changed']:
+        lines.append(f"~ {new['access']} ({new['class']})")
+        for column in ('description', 'type'):
+            if old[column] != new[column]:
+                lines.append(f"    {column}: {old[column]!r} -> {new[column]!r}")
+    return '\n'.join(lines)
+
+
+def main(stubs=False, event_costs=EVENT_COSTS):
     if stubs:
         # Generate stubs files
-        stub_files = [
-            DOCS / 'guides' / '_viewer_events.md',
-            DOCS / 'guides' / '_layerlist_events.md',
-            DOCS / 'guides' / '_layer_events.md',
-        ]
-        for file_path in stub_files:
+        for file_path in TABLE_OUTPUTS:
             if not file_path.exists():  # Avoid overwriting existing files
                 file_path.write_text(
                     "This is a stub. The real file is autogenerated in a full build.",
                     encoding="utf-8",
                 )
+        if not COSTS_PATH.exists():
+            # like a full build without --event-costs
+            COSTS_PATH.write_text('', encoding='utf-8')
     else:
-        HEADER = [
-            'Event',
-            'Description',
-            'Event.value type',
-        ]
-
-        # Do viewer events
-        rows = [
-            ev.ev_model_row()[2:]
-            for ev in iter_evented_model_events()
-            if ev.access_at()
-        ]
-        table1 = table_repr(rows, padding=2, header=HEADER, divide_rows=False)
-        (DOCS / 'guides' / '_viewer_events.md').write_text(table1)
-
-        # Do LayerList events
-        rows = [
-            ev.layer_row()[2:]
-            for ev in iter_evented_container_events(
-                napari, container_class=LayerList
-            )
-            if ev.access_at()
-        ]
-        table2 = table_repr(rows, padding=2, header=HEADER, divide_rows=False)
-        (DOCS / 'guides' / '_layerlist_events.md').write_text(table2)
-
-        # Do layer events
-        HEADER = [
-            'Class',
-            'Event',
-            'Description',
-            'Event.value type',
-        ]
-        rows = [
-            [ev.layer_row()[0]] + ev.layer_row()[2:] for ev in iter_layer_events()
-        ]
-        rows = merge_image_and_label_rows(rows)
-        table3 = table_repr(rows, padding=2, header=HEADER, divide_rows=False)
-        (DOCS / 'guides' / '_layer_events.md').write_text(table3)
+        render(collect(event_costs=event_costs))
 
 
 if __name__ == '__main__':
@@ -344,6 +926,26 @@ if __name__ == '__main__':
         action="store_true",
         help="Generate stubs versions of the event docs.",
     )
+    parser.add_argument(
+        "--event-costs",
+        action="store_true",
+        default=EVENT_COSTS,
+        help="Also measure the emission cost of each event (slow).",
+    )
+    parser.add_argument(
+        "--diff",
+        nargs=2,
+        type=Path,
+        metavar=("OLD", "NEW"),
+        help="Compare two event catalogs instead, exit with 1 if they differ.",
+    )
     args = parser.parse_args()
 
-    main(stubs=args.stubs)
+    if args.diff:
+        old, new = (load_catalog(path) for path in args.diff)
+        diff = diff_catalogs(old, new)
+        print(f"napari {old['napari']} -> {new['napari']}")
+        print(format_diff(diff) or "No changes")
+        sys.exit(1 if any(diff.values()) else 0)
+
+    main(stubs=args.stubs, event_costs=args.event_costs)
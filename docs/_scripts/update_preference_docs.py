@@ -27,6 +27,9 @@ From command line:
     # Generate only stub documentation (for quick builds)
     python update_preference_docs.py --stubs
 
+    # Capture the screenshots in 4 processes
+    python update_preference_docs.py --jobs 4
+
 From another script:
     from update_preference_docs import main
     main(stubs=False)  # Generate full documentation
@@ -36,15 +39,33 @@ Key Functions
 generate_images()
     Captures screenshots of the preferences dialog for each section.
 
-create_preferences_docs()
-    Generates the markdown documentation using a Jinja2 template.
+capture_images(jobs=1)
+    Captures all the screenshots, sharding the sections over worker
+    processes that each render their own offscreen dialog.
+
+settings_sections()
+    Collects the documented fields of each NapariSettings section.
+
+image_cache_key()
+    Hash of the settings schema, stylesheet and versions the screenshots
+    depend on; screenshots taken for the same key are reused.
+
+create_preferences_docs(sections)
+    Generates the markdown documentation from the ``preferences.md.jinja``
+    template, see ``_jinja.py``.
 
-main(stubs=False)
+collect() / render(sections)
+    The expensive and the cheap half of the full generation, used separately
+    by the prep server to regenerate the page from memory.
+
+main(stubs=False, jobs=None)
     Main entry point that coordinates the documentation generation.
 
 Notes
 -----
-- Screenshots are captured using Qt's grab() method
+- Screenshots are captured using Qt's grab() method, as soon as each page
+  has been painted; no fixed delays are used and the dialog renders with the
+  ``offscreen`` Qt platform unless ``QT_QPA_PLATFORM`` is set
 - The preferences dialog is styled with the dark theme for consistency
 - Documentation is generated from the NapariSettings model fields
 - Settings marked with `preferences_exclude` are documented but noted as not
@@ -56,145 +77,389 @@ This docstring was drafted with the assistance of Claude Code.
 The output was reviewed and edited for accuracy and clarity.
 """
 
+import hashlib
+import json
+import os
 from pathlib import Path
 
-from jinja2 import Template
-from napari._pydantic_compat import ModelMetaclass
-from qtpy.QtCore import QTimer
-from qtpy.QtWidgets import QMessageBox
+from _fingerprint import CACHE_DIR, package_path, package_version
+from _jinja import render_template, template_path
+from _output import save_pixmap, write_bytes, write_text
+from _profiling import stage
 
-from napari._qt.dialogs.preferences_dialog import PreferencesDialog
-from napari._qt.qt_event_loop import get_qapp
-from napari._qt.qt_resources import get_stylesheet
-from napari.settings import NapariSettings
+# napari and Qt are imported in the functions that need them, and jinja2 by
+# `_jinja`, so that generating the stubs does not pay for importing them.
 
 DOCS = REPO_ROOT_PATH = Path(__file__).resolve().parent.parent
 GUIDES_PATH = DOCS / "guides"
 IMAGES_PATH = DOCS / "images" / "_autogenerated"
 IMAGES_PATH.mkdir(parents=True, exist_ok=True)
-PREFERENCES_TEMPLATE = """(napari-preferences)=
+# copies of the last screenshots, with the key they were captured for
+IMAGE_CACHE = CACHE_DIR / "preference_images"
+# worker processes capturing the screenshots, see `capture_images`
+PREFERENCE_JOBS = int(os.environ.get("NAPARI_DOCS_PREFERENCE_JOBS") or 1)
+# bump to invalidate the cached screenshots when the capture changes
+_IMAGE_CACHE_VERSION = 3
+PREFERENCES_TEMPLATE = "preferences.md.jinja"
+OUTPUTS = [
+    GUIDES_PATH / "preferences.md",
+    IMAGES_PATH / "preferences-reset.png",
+]
+
+
+def fingerprint_inputs():
+    """Inputs that determine the preferences page and its screenshots."""
+    return {
+        "packages": ["napari", "qtpy", "PyQt5", "PyQt6", "PySide2", "PySide6"],
+        "paths": [
+            package_path("napari"),
+            Path(__file__),
+            template_path(PREFERENCES_TEMPLATE),
+        ],
+    }
+
+
+def _when_painted(widget, callback):
+    """Call `callback` once `widget` has been painted again.
+
+    The callback runs from the event loop right after the next paint event
+    of `widget` is handled, so a grab taken from it shows the finished page.
+    """
+    from qtpy.QtCore import QEvent, QObject, QTimer
 
-# Preferences
+    class PaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                obj.removeEventFilter(self)
+                self.deleteLater()
+                # let the paint event complete before grabbing
+                QTimer.singleShot(0, callback)
+            return False
 
-Starting with version 0.4.6, napari provides persistent settings.
+    widget.installEventFilter(PaintFilter(widget))
+    widget.update()
 
-Settings are managed by getting the global settings object and modifying settings:
 
-```python
-from napari.settings import get_settings
+def section_titles():
+    """Titles of the settings sections, in the order of the dialog pages."""
+    from napari._pydantic_compat import ModelMetaclass
 
-settings = get_settings()
-# then modify... e.g:
-settings.appearance.theme = 'dark'
-```
+    from napari.settings import NapariSettings
 
-## Reset to defaults via CLI
+    return [field.field_info.title or name
+            for name, field in NapariSettings.__fields__.items()
+            if isinstance(field.type_, ModelMetaclass)]
 
-To reset all napari settings to the default values:
 
-```bash
-napari --reset
-```
+def generate_images(timeout=30, only=None, reset=True):
+    """
+    Generate images from `CORE_SETTINGS`. and save them in the developer
+    section of the docs.
 
-## The preferences dialog
+    Each section is grabbed as soon as its page has been painted, and the
+    event loop exits once the last image is saved. `timeout` (in seconds)
+    only bounds a capture that never completes.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        Seconds after which the images not captured yet are failed.
+    only : list of int, optional
+        Indices of the sections to capture, all of them by default.
+    reset : bool, optional
+        Whether to capture the restore defaults box.
+
+    Returns
+    -------
+    dict
+        Maps the name of each image that could not be captured to the error.
+    """
+    from functools import partial
 
-Starting with version 0.4.6, napari provides a preferences dialog to manage
-some of the provided options.
+    # no display is needed to render the dialog
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
-{%- for section, section_data in sections.items() %}
+    from qtpy.QtCore import QTimer
+    from qtpy.QtWidgets import QMessageBox
 
-### {{ section_data["title"] }}
+    from napari._qt.dialogs.preferences_dialog import PreferencesDialog
+    from napari._qt.qt_event_loop import get_qapp
+    from napari._qt.qt_resources import get_stylesheet
 
-![{{ section }}]({{ images_path }}/preferences-{{ section }}.png)
+    app = get_qapp()
+    pref = PreferencesDialog()
+    pref.setStyleSheet(get_stylesheet("dark"))
 
-{% endfor%}
+    sections = section_titles()
+    if only is None:
+        only = range(len(sections))
 
-### Reset to defaults via UI
+    def show_section(idx):
+        pref._stack.setCurrentIndex(idx)
+        pref._list.setCurrentRow(idx)
+        return pref._stack.currentWidget()
 
-To reset the preferences click on the `Restore defaults` button and continue
-by clicking on `Restore`.
+    def grab_section(name):
+        save_pixmap(pref.grab(), IMAGES_PATH / name)
 
-![{{ reset }}]({{ images_path }}/preferences-reset.png)
+    box = QMessageBox(
+        QMessageBox.Icon.Question,
+        "Restore Settings",
+        "Are you sure you want to restore default settings?",
+        QMessageBox.RestoreDefaults | QMessageBox.Cancel,
+        pref,
+    )
 
-## Sections
+    def show_reset():
+        box.show()
+        return box
 
-The settings are grouped by sections and napari core provides the following:
+    def grab_reset():
+        save_pixmap(box.grab(), IMAGES_PATH / "preferences-reset.png")
+        box.reject()
 
-{%- for section, section_data in sections.items() %}
+    # (image name, show the page and return the widget to wait for, grab)
+    steps = [
+        (
+            f"preferences-{sections[idx].lower()}.png",
+            partial(show_section, idx),
+            partial(grab_section, f"preferences-{sections[idx].lower()}.png"),
+        )
+        for idx in only
+    ]
+    if reset:
+        steps.append(("preferences-reset.png", show_reset, grab_reset))
+    current = []
+    failures = {}
+
+    # Exceptions raised in Qt callbacks would otherwise be lost; they are
+    # recorded for the image being captured, and the next one is started.
+    def next_step():
+        while steps:
+            current[:] = steps.pop(0)
+            name, show, grab = current
+            try:
+                widget = show()
+            except Exception as e:  # noqa: BLE001
+                failures[name] = f"{type(e).__name__}: {e}"
+                continue
+            _when_painted(widget, partial(finish, name, grab))
+            return
+        current.clear()
+        app.quit()
+
+    def finish(name, grab):
+        try:
+            with stage(f"grab {name}"):
+                grab()
+        except Exception as e:  # noqa: BLE001
+            failures[name] = f"{type(e).__name__}: {e}"
+        next_step()
+
+    def timed_out():
+        for name, *_ in [current, *steps] if current else steps:
+            failures[name] = f"not captured within {timeout} s"
+        steps.clear()
+        app.quit()
+
+    watchdog = QTimer()
+    watchdog.setSingleShot(True)
+    watchdog.timeout.connect(timed_out)
+    watchdog.start(int(timeout * 1000))
 
-### {{ section_data["title"]|upper }}
+    pref.show()
+    QTimer.singleShot(0, next_step)
+    with stage("Qt event loop"):
+        app.exec_()
+    watchdog.stop()
+    pref.close()
+    return failures
 
-{{ section_data["description"] }}
 
-{%   for fields in section_data["fields"] %}
-#### {{ fields["title"] }}
+def _capture_shard(only, reset):
+    """Entry point of the worker processes of `capture_images`."""
+    return generate_images(only=only, reset=reset)
 
-*{{ fields["description"] }}*
 
-* <small>Access programmatically with `SETTINGS.{{ section }}.{{ fields["field"] }}`.</small>
-* <small>Type: `{{ fields["type"] }}`.</small>
-* <small>Default: `{{ fields["default"] }}`.</small>
-{% if fields["ui"] %}* <small>UI: This setting can be configured via the preferences dialog.</small>{% endif %}
-{%-   endfor -%}
-{% endfor %}
+def capture_images(jobs=1):
+    """Capture all the screenshots, in `jobs` worker processes if above 1.
 
-**Support for plugin specific settings will be provided in an upcoming release.**
+    Each worker creates its own offscreen dialog and captures every
+    `jobs`-th section; the first one also captures the restore defaults
+    box. A failure is reported for each image that could not be captured,
+    including those of a worker that crashed.
 
-"""
+    Raises
+    ------
+    RuntimeError
+        If any image could not be captured.
+    """
+    if jobs <= 1:
+        failures = generate_images()
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from contextlib import ExitStack
+
+        titles = section_titles()
+        shards = [
+            shard
+            for shard in (list(range(i, len(titles), jobs)) for i in range(jobs))
+            if shard
+        ] or [[]]
+        failures = {}
+        # Qt must not be forked, each worker imports napari afresh
+        ctx = multiprocessing.get_context("spawn")
+        with ExitStack() as stack:
+            futures = []
+            for i, shard in enumerate(shards):
+                # a pool per worker, so that a crash only fails its sections
+                pool = stack.enter_context(
+                    ProcessPoolExecutor(1, mp_context=ctx)
+                )
+                futures.append(
+                    (pool.submit(_capture_shard, shard, i == 0), shard, i == 0)
+                )
+            for future, shard, reset in futures:
+                try:
+                    failures.update(future.result())
+                except Exception as e:  # noqa: BLE001
+                    names = image_names(titles[idx].lower() for idx in shard)
+                    failures.update(
+                        dict.fromkeys(
+                            names if reset else names[:-1],
+                            f"worker failed: {type(e).__name__}: {e}",
+                        )
+                    )
+    if failures:
+        raise RuntimeError(
+            "Could not capture the preference screenshots:\n"
+            + "\n".join(
+                f"  {name}: {error}" for name, error in sorted(failures.items())
+            )
+        )
 
 
-def generate_images():
-    """
-    Generate images from `CORE_SETTINGS`. and save them in the developer
-    section of the docs.
-    """
+def image_names(sections):
+    """File names of the screenshots of the dialog showing `sections`."""
+    return [f"preferences-{section}.png" for section in sections] + [
+        "preferences-reset.png"
+    ]
 
-    app = get_qapp()
-    pref = PreferencesDialog()
-    pref.setStyleSheet(get_stylesheet("dark"))
-    pref.show()
-    QTimer.singleShot(1000, pref.close)
 
-    # Collect all sections first
-    sections = [field.field_info.title or name
-                for name, field in NapariSettings.__fields__.items()
-                if isinstance(field.type_, ModelMetaclass)]
+def _stable_default(value):
+    """JSON-able form of a setting default that `json` cannot encode.
 
-    # Process each section with proper timing
-    for idx, title in enumerate(sections):
-        # Set current index
-        pref._stack.setCurrentIndex(idx)
-        pref._list.setCurrentRow(idx)
+    Unlike ``repr``, which includes the address of objects such as
+    ``KeyBinding``, the result is the same in every process.
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted(map(str, value))
+    if callable(getattr(value, "dict", None)):  # nested settings models
+        return value.dict()
+    return str(value)
 
-        # Process events to ensure UI has updated
-        app.processEvents()
 
-        # Capture screenshot
-        pixmap = pref.grab()
-        pixmap.save(str(IMAGES_PATH / f"preferences-{title.lower()}.png"))
+def settings_schema():
+    """Names, titles, descriptions, types and defaults of all settings.
 
+    Unlike `settings_sections`, defaults are serialised to JSON, so the
+    result can be hashed across processes, see `image_cache_key`.
+    """
+    from napari._pydantic_compat import ModelMetaclass
 
+    from napari.settings import NapariSettings
 
-    box = QMessageBox(
-        QMessageBox.Icon.Question,
-        "Restore Settings",
-        "Are you sure you want to restore default settings?",
-        QMessageBox.RestoreDefaults | QMessageBox.Cancel,
-        pref,
-    )
-    box.show()
+    schema = []
+    for name, field in NapariSettings.__fields__.items():
+        if not isinstance(field.type_, ModelMetaclass):
+            continue
+        excluded = getattr(field.type_.NapariConfig, "preferences_exclude", [])
+        schema.append(
+            [
+                name,
+                field.field_info.title,
+                field.field_info.description,
+                [
+                    [
+                        n,
+                        f.field_info.title,
+                        f.field_info.description,
+                        str(f._type_display()),
+                        json.dumps(
+                            f.get_default(),
+                            sort_keys=True,
+                            default=_stable_default,
+                        ),
+                        n not in excluded,
+                    ]
+                    for n, f in sorted(field.type_.__fields__.items())
+                ],
+            ]
+        )
+    return schema
+
+
+def image_cache_key():
+    """Hash of everything the screenshots of the dialog depend on.
+
+    That is the settings schema, see `settings_schema`, the ``.qss`` files
+    and the dark theme the stylesheet is built from, and the napari and Qt
+    versions. Nothing from ``napari._qt`` is imported, which takes seconds,
+    and no QApplication is created.
+    """
+    import qtpy
+
+    from napari.utils.theme import get_theme
+
+    styles = package_path("napari") / "_qt" / "qt_resources" / "styles"
+    key = {
+        "version": _IMAGE_CACHE_VERSION,
+        "schema": settings_schema(),
+        "styles": {
+            path.name: hashlib.sha256(path.read_bytes()).hexdigest()
+            for path in sorted(styles.glob("*.qss"))
+        },
+        "theme": get_theme("dark").to_rgb_dict(),
+        "napari": package_version("napari"),
+        "qt": [qtpy.API_NAME, qtpy.QT_VERSION],
+    }
+    return hashlib.sha256(
+        json.dumps(key, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def restore_images(key, names, cache=IMAGE_CACHE):
+    """Copy the cached screenshots to the docs if they were taken for `key`.
+
+    Returns False, leaving the docs untouched, if any image is missing.
+    """
+    try:
+        if (cache / "key").read_text(encoding="utf-8") != key:
+            return False
+        images = {name: (cache / name).read_bytes() for name in names}
+    except OSError:
+        return False
+    for name, data in images.items():
+        write_bytes(IMAGES_PATH / name, data)
+    return True
 
-    def grab():
-        pixmap = box.grab()
-        pixmap.save(str(IMAGES_PATH / "preferences-reset.png"))
-        box.reject()
 
-    QTimer.singleShot(300, grab)
-    app.exec_()
+def store_images(key, names, cache=IMAGE_CACHE):
+    """Keep a copy of the screenshots taken for `key`."""
+    (cache / "key").unlink(missing_ok=True)
+    for name in names:
+        write_bytes(cache / name, (IMAGES_PATH / name).read_bytes())
+    # written last, so an interrupted copy is never used
+    write_text(cache / "key", key)
 
 
-def create_preferences_docs():
-    """Create preferences docs from SETTINGS using a jinja template."""
+def settings_sections():
+    """Collect the title, description and fields of each settings section."""
+    from napari._pydantic_compat import ModelMetaclass
+
+    from napari.settings import NapariSettings
+
     sections = {}
 
     for name, field in NapariSettings.__fields__.items():
@@ -220,6 +485,13 @@ def create_preferences_docs():
                 if n not in ('schema_version')
             ],
         }
+    return sections
+
+
+def create_preferences_docs(sections=None):
+    """Create preferences docs from SETTINGS using a jinja template."""
+    if sections is None:
+        sections = settings_sections()
 
     # pathlib strips trailing slashes, but because of the organization
     # of docs across napari/napari and napari/napari.github.io, we need
@@ -228,13 +500,44 @@ def create_preferences_docs():
     #   docs/guides/images/_autogenerated
     # in napari/napari.github.io, they are located at
     #   guides/stable/images/_autogenerated
-    text = Template(PREFERENCES_TEMPLATE).render(
-        sections=sections, images_path="../images/_autogenerated"
+    text = render_template(
+        PREFERENCES_TEMPLATE,
+        sections=sections,
+        images_path="../images/_autogenerated",
     )
-    (GUIDES_PATH / "preferences.md").write_text(text)
+    write_text(GUIDES_PATH / "preferences.md", text)
 
 
-def main(stubs=False):
+def collect(jobs=None):
+    """Capture the screenshots and return the settings sections.
+
+    This is the expensive part of the generation; the result can be kept
+    in memory and passed to `render` again, see ``_prep_server.py``.
+    The screenshots are reused from `IMAGE_CACHE`, without starting Qt,
+    if nothing they depend on changed, see `image_cache_key`. Otherwise
+    they are captured in `jobs` processes, `PREFERENCE_JOBS` by default.
+    """
+    if jobs is None:
+        jobs = PREFERENCE_JOBS
+    sections = settings_sections()
+    key = image_cache_key()
+    names = image_names(sections)
+    with stage("restore cached preference images"):
+        restored = restore_images(key, names)
+    if not restored:
+        with stage("generate_images"):
+            capture_images(jobs)
+        store_images(key, names)
+    return sections
+
+
+def render(sections):
+    """Write the preferences page from the sections returned by `collect`."""
+    with stage("create_preferences_docs"):
+        create_preferences_docs(sections)
+
+
+def main(stubs=False, jobs=None):
     if stubs:
         # Generate stubs file
         file_path = GUIDES_PATH / "preferences.md"
@@ -244,8 +547,7 @@ def main(stubs=False):
                 encoding="utf-8",
             )
     else:
-        generate_images()
-        create_preferences_docs()
+        render(collect(jobs))
 
 
 if __name__ == "__main__":
@@ -257,6 +559,17 @@ if __name__ == "__main__":
         action="store_true",
         help="Generate stubs versions of the preference docs.",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Capture the screenshots in N processes, 0 for one per CPU "
+        "(default: NAPARI_DOCS_PREFERENCE_JOBS or 1).",
+    )
     args = parser.parse_args()
 
-    main(stubs=args.stubs)
+    jobs = args.jobs
+    if jobs == 0:
+        jobs = os.cpu_count()
+    main(stubs=args.stubs, jobs=jobs)
@@ -43,7 +43,8 @@ extract_version_from_filename(filename)
     Converts filename like "release_0_6_4.md" to version "0.6.4".
 
 create_whats_new_docs(releases)
-    Generates MyST markdown using Jinja2 template with time-based groupings.
+    Generates MyST markdown from the ``release_index.md.jinja`` template,
+    see ``_jinja.py``, with time-based groupings.
 
 main(stubs=False)
     Main entry point that coordinates the documentation generation.
@@ -57,48 +58,38 @@ Notes
 """
 
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from jinja2 import Template
+from _jinja import render_template, template_path
+from _output import write_text
+from _profiling import stage
 
 # Path constants
 DOCS = Path(__file__).parent.parent.absolute()
 RELEASE_PATH = DOCS / "release"
 
-# MyST template for the release notes index page
-RELEASE_INDEX_TEMPLATE = """(release-notes)=
-
-# Release Notes
-
-Each section shows the highlights from recent releases. Click on the version links to view the complete release notes.
-
-*Last updated: {{ last_updated }}*
-
-{% if recent %}
-## Recent Releases (Last 3 Months)
-
-Latest features and improvements:
-
-{{ recent_content }}
-{% endif %}
-{% if earlier_this_year %}
-## Releases from 3-6 Months Ago
-
-{{ earlier_content }}
-{% endif %}
-{% if this_year %}
-## Releases from 6-12 Months Ago
-
-{{ this_year_content }}
-{% endif %}
-{% if older %}
-## Older Releases
-
-{{ older_content }}
-{% endif %}
-"""
+# MyST template for the release notes index page, see _jinja.py
+RELEASE_INDEX_TEMPLATE = "release_index.md.jinja"
+OUTPUTS = [RELEASE_PATH / "index.md"]
+
+
+def fingerprint_inputs():
+    """Inputs that determine the release notes index.
+
+    The grouping into time periods and the "Last updated" line depend on the
+    current date, so the index is regenerated at most once per day when no
+    release file changed.
+    """
+    return {
+        "paths": [
+            Path(__file__),
+            template_path(RELEASE_INDEX_TEMPLATE),
+            *sorted(RELEASE_PATH.glob("release_*.md")),
+        ],
+        "extra": [date.today().isoformat()],
+    }
 
 
 def extract_date_from_release(content: str) -> Optional[datetime]:
@@ -261,7 +252,8 @@ def create_release_index_docs():
     """Create release index docs from release files using a jinja template."""
     
     # Parse all releases
-    releases = parse_releases()
+    with stage("parse_releases"):
+        releases = parse_releases()
     
     # Group releases by time periods
     now = datetime.now()
@@ -284,7 +276,7 @@ def create_release_index_docs():
     
     # Generate content for each section
     template_vars = {
-        'last_updated': now.strftime("%B %d, %Y"),
+        'last_updated': now,
         'recent': recent,
         'recent_content': generate_release_dropdowns(recent) if recent else "",
         'earlier_this_year': earlier_this_year,
@@ -296,11 +288,11 @@ def create_release_index_docs():
     }
     
     # Generate the page content
-    text = Template(RELEASE_INDEX_TEMPLATE).render(**template_vars)
+    text = render_template(RELEASE_INDEX_TEMPLATE, **template_vars)
     
     # Write the file
     output_file = RELEASE_PATH / "index.md"
-    output_file.write_text(text, encoding='utf-8')
+    write_text(output_file, text)
 
 
 def main(stubs=False):
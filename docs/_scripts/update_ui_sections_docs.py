@@ -52,6 +52,16 @@ generate_docs_ui_section_page(section_name, mermaid_diagram, directory_layout, o
 generate_docs_ui_section(section_name, output_page, pydeps_args, mermaid_graph_base_properties)
     Orchestrates the generation of all content for a UI section.
 
+render_docs_ui_section(section_name, output_page, dep_graph, mermaid_graph_base_properties)
+    Generates the content of a UI section from its dependencies graph.
+
+get_ui_sections()
+    Returns the parameters of every documented UI section.
+
+collect() / render(collected)
+    The expensive and the cheap half of the full generation, used separately
+    by the prep server to regenerate the pages from memory.
+
 main(stubs=False)
     Main entry point that coordinates documentation generation.
 
@@ -73,20 +83,13 @@ The output was reviewed and edited for accuracy and clarity.
 import json
 from pathlib import Path
 
-# ---- Napari imports
-from napari._qt.containers import qt_layer_list
-from napari._qt.layer_controls import qt_layer_controls_container
-from napari._qt.widgets import qt_viewer_status_bar
-from napari._qt._qapp_model import qactions
-from napari._qt import qt_viewer
-from napari._qt import dialogs
-from napari_console import qt_console
-
-# ---- Third-party imports
-from pydeps import cli, colors, dot, py2depgraph
-from pydeps.pydeps import depgraph_to_dotsrc
-from pydeps.target import Target
-import seedir as sd
+# ---- Local imports
+# pydeps and seedir are imported in the functions that use them, and the
+# napari modules are located without importing them, so that generating the
+# stubs does not pay for importing napari, Qt and pydeps.
+from _fingerprint import package_path
+from _output import write_bytes, write_text
+from _profiling import stage
 
 # ---- General constants
 # Docs paths
@@ -94,14 +97,49 @@ DOCS = Path(__file__).parent.parent
 UI_SECTIONS_DOCS_ROOT_PATH = DOCS / "developers" / "architecture" / "ui_sections"
 
 # Napari and Napari UI sections modules paths
-NAPARI_ROOT_DIRECTORY_PATH = Path(qt_layer_list.__file__).parent.parent.parent
-LAYER_LIST_MODULE_PATH = Path(qt_layer_list.__file__)
-LAYER_CONTROLS_MODULE_PATH = Path(qt_layer_controls_container.__file__)
-APPLICATION_STATUS_BAR_MODULE_PATH = Path(qt_viewer_status_bar.__file__)
-APPLICATION_MENUS_MODULE_PATH = Path(qactions.__file__)
-VIEWER_MODULE_PATH = Path(qt_viewer.__file__)
-DIALOGS_MODULE_PATH = Path(dialogs.__file__).parent
-CONSOLE_MODULE_PATH = Path(qt_console.__file__).parent
+# fall back to a placeholder so that the module can be imported without
+# napari, e.g. to benchmark the diagram functions with synthetic graphs
+NAPARI_ROOT_DIRECTORY_PATH = package_path("napari") or Path("napari")
+_QT_PATH = NAPARI_ROOT_DIRECTORY_PATH / "_qt"
+LAYER_LIST_MODULE_PATH = _QT_PATH / "containers" / "qt_layer_list.py"
+LAYER_CONTROLS_MODULE_PATH = (
+    _QT_PATH / "layer_controls" / "qt_layer_controls_container.py"
+)
+APPLICATION_STATUS_BAR_MODULE_PATH = (
+    _QT_PATH / "widgets" / "qt_viewer_status_bar.py"
+)
+APPLICATION_MENUS_MODULE_PATH = (
+    _QT_PATH / "_qapp_model" / "qactions" / "__init__.py"
+)
+VIEWER_MODULE_PATH = _QT_PATH / "qt_viewer.py"
+DIALOGS_MODULE_PATH = _QT_PATH / "dialogs"
+CONSOLE_MODULE_PATH = package_path("napari_console")
+
+# Generated pages, one per UI section defined in `main`
+OUTPUTS = [
+    UI_SECTIONS_DOCS_ROOT_PATH / page
+    for page in (
+        "layers_list_ui.md",
+        "layers_controls_ui.md",
+        "application_status_bar_ui.md",
+        "application_menus_ui.md",
+        "viewer_ui.md",
+        "dialogs_ui.md",
+        "console_ui.md",
+    )
+]
+
+
+def fingerprint_inputs():
+    """Inputs that determine the generated UI section pages."""
+    return {
+        "packages": ["napari", "napari-console", "pydeps", "seedir"],
+        "paths": [
+            package_path("napari"),
+            package_path("napari_console"),
+            Path(__file__),
+        ],
+    }
 
 
 # ---- Utility functions
@@ -128,6 +166,10 @@ def generate_dependencies_graph(options):
         It can return `None` depending on the options passed.
 
     """
+    from pydeps import colors, dot, py2depgraph
+    from pydeps.pydeps import depgraph_to_dotsrc
+    from pydeps.target import Target
+
     colors.START_COLOR = options["start_color"]
     target = Target(options["fname"])
     with target.chdir_work():
@@ -137,9 +179,7 @@ def generate_dependencies_graph(options):
     if not options["no_output"]:
         graph_content = dot.call_graphviz_dot(dot_src, options["format"])
         if options["output"]:
-            output_file = Path(options["output"])
-            output_file.parent.mkdir(exist_ok=True, parents=True)
-            output_file.write_bytes(graph_content)
+            write_bytes(options["output"], graph_content)
     return dep_graph, dot_src, graph_content
 
 
@@ -169,6 +209,8 @@ def generate_directory_layout(
         The directory layout generated.
 
     """
+    import seedir as sd
+
     dependencies_dict = json.loads(str(dependencies_graph))
     files_to_include = []
     for dependency in dependencies_dict.values():
@@ -199,9 +241,7 @@ def generate_directory_layout(
     directory_layout_content += "```\n"
 
     if output_file:
-        output_file = Path(output_file)
-        output_file.parent.mkdir(exist_ok=True, parents=True)
-        output_file.write_text(directory_layout_content, encoding="utf-8")
+        write_text(output_file, directory_layout_content)
 
     return directory_layout_content
 
@@ -384,8 +424,7 @@ def generate_docs_ui_section_page(
     page_content += "### Source code directory layout (related to modules inside `napari`)\n"
     page_content += directory_layout
     if output_file:
-        output_file.parent.mkdir(exist_ok=True, parents=True)
-        output_file.write_text(page_content, encoding="utf-8")
+        write_text(output_file, page_content)
 
     return page_content
 
@@ -428,12 +467,56 @@ def generate_docs_ui_section(
         Content of generated UI section page.
 
     """
+    from pydeps import cli
+
     options = cli.parse_args(pydeps_args)
-    (
+    with stage(f"pydeps: {section_name}"):
+        (
+            dep_graph,
+            dot_src,
+            pydeps_graph,
+        ) = generate_dependencies_graph(options)
+    mermaid_graph, dir_layout, ui_page = render_docs_ui_section(
+        section_name,
+        output_page,
         dep_graph,
-        dot_src,
-        pydeps_graph,
-    ) = generate_dependencies_graph(options)
+        mermaid_graph_base_properties,
+    )
+    return dep_graph, dot_src, pydeps_graph, mermaid_graph, dir_layout, ui_page
+
+
+def render_docs_ui_section(
+    section_name,
+    output_page,
+    dep_graph,
+    mermaid_graph_base_properties,
+):
+    """
+    Generate the mermaid diagram, the directory layout and the page of a UI
+    section from an already computed dependencies graph.
+
+    Parameters
+    ----------
+    section_name : str
+        The name of the UI section.
+    output_page : Path
+        Path to file where the generated page content will be written.
+    dep_graph : DepGraph
+        Dependency graph constructed by pydeps for the UI section.
+    mermaid_graph_base_properties : dict
+        Dictionary with the base configuration needed to generate a mermaid
+        diagram.
+
+    Returns
+    -------
+    mermaid_graph : str
+        Generated mermaid graph.
+    dir_layout : str
+        Generated directory layout of the UI section.
+    ui_page : str
+        Content of generated UI section page.
+
+    """
     graph_title = (
         f"Dependencies between modules in the napari {section_name} UI section"
     )
@@ -441,24 +524,36 @@ def generate_docs_ui_section(
         "Diagram showing the dependencies between the modules "
         f"involved in the definition of the napari {section_name} UI section"
     )
-    mermaid_graph = generate_mermaid_diagram(
-        dep_graph,
-        **mermaid_graph_base_properties,
-        graph_title=graph_title,
-        graph_description=graph_description,
-    )
-    dir_layout = generate_directory_layout(dep_graph)
+    with stage(f"mermaid diagram: {section_name}"):
+        mermaid_graph = generate_mermaid_diagram(
+            dep_graph,
+            **mermaid_graph_base_properties,
+            graph_title=graph_title,
+            graph_description=graph_description,
+        )
+    with stage(f"directory layout: {section_name}"):
+        dir_layout = generate_directory_layout(dep_graph)
     ui_page = generate_docs_ui_section_page(
         section_name,
         mermaid_graph,
         dir_layout,
         output_page,
     )
-    return dep_graph, dot_src, pydeps_graph, mermaid_graph, dir_layout, ui_page
+    return mermaid_graph, dir_layout, ui_page
 
 
 # ---- Main and UI sections parameters
-def main(stubs=False):
+def get_ui_sections():
+    """
+    Return the parameters of every documented UI section.
+
+    Returns
+    -------
+    ui_sections : list of tuple
+        For each section, its name, output page path, pydeps arguments and
+        base mermaid diagram settings.
+
+    """
     # General 'settings'
     mermaid_graph_base_settings = {
         "graph_orientation": "LR",
@@ -767,13 +862,62 @@ def main(stubs=False):
         )
     )
 
+    return ui_sections
+
+
+def collect():
+    """
+    Run the pydeps dependency analysis of every UI section.
+
+    This is the expensive part of the generation; the result can be kept
+    in memory and passed to `render` again, see ``_prep_server.py``.
+
+    Returns
+    -------
+    collected : list of tuple
+        For each section, its name, output page path, dependency graph and
+        base mermaid diagram settings.
+
+    """
+    from pydeps import cli
+
+    collected = []
     for (
         section_name,
         output_page,
         pydeps_args,
         mermaid_graph_base_settings,
-    ) in ui_sections:
-        if stubs:
+    ) in get_ui_sections():
+        with stage(f"pydeps: {section_name}"):
+            dep_graph, _, _ = generate_dependencies_graph(
+                cli.parse_args(pydeps_args)
+            )
+        collected.append(
+            (section_name, output_page, dep_graph, mermaid_graph_base_settings)
+        )
+    return collected
+
+
+def render(collected):
+    """Write the UI section pages from the graphs returned by `collect`."""
+    for (
+        section_name,
+        output_page,
+        dep_graph,
+        mermaid_graph_base_settings,
+    ) in collected:
+        with stage(f"UI section: {section_name}"):
+            render_docs_ui_section(
+                section_name,
+                output_page,
+                dep_graph,
+                mermaid_graph_base_settings,
+            )
+
+
+def main(stubs=False):
+    if stubs:
+        for section_name, output_page, _, _ in get_ui_sections():
             # Generate stubs content
             if not output_page.exists():  # Avoid overwriting existing files
                 output_page.parent.mkdir(exist_ok=True, parents=True)
@@ -781,14 +925,8 @@ def main(stubs=False):
                     f"## {section_name}\nThis is a stub. The real file is autogenerated in a full build.",
                     encoding="utf-8",
                 )
-        else:
-            # Generate full content
-            generate_docs_ui_section(
-                section_name,
-                output_page,
-                pydeps_args,
-                mermaid_graph_base_settings,
-            )
+    else:
+        render(collect())
 
 
 if __name__ == "__main__":
@@ -232,6 +232,8 @@ exclude_patterns = [
     ".jupyter_cache",
     "jupyter_execute",
     "plugins/_*.md",
+    # generated tables, only read through the include directive
+    "guides/_*.md",
     "plugins/building_a_plugin/_layer_data_guide.md",
     "gallery/index.rst",
     "_scripts/README.md",